@@ -0,0 +1,79 @@
+"""
+Same Game Anytime Output
+Lets a long-running solver keep its best solution so far on disk, so killing it (or hitting a
+deadline) never loses everything it found.
+
+A Checkpoint writes the best solution to an output file whenever a better one turns up (optionally
+at most once per interval, since writing a long move list isn't free), always through a temporary
+file and os.replace so the file is never seen half written. It can also catch SIGTERM, so a solver
+that checks stop_requested() stops cleanly and prints what it has.
+
+On the harness side, run_with_grace runs a solver with a time limit the same way: at the limit it
+sends SIGTERM and gives the solver a grace period to print its best before killing it.
+"""
+
+import os
+import signal
+import subprocess
+import tempfile
+import time
+
+import engine
+
+
+class Checkpoint:
+    def __init__(self, output_file=None, time_limit=None, interval=0.0, catch_sigterm=False):
+        self.output_file = output_file
+        self.deadline = None if time_limit is None else time.time() + time_limit
+        self.interval = interval
+        self.saved_score = -1
+        self.last_save = 0.0
+        self.terminated = False
+        if catch_sigterm:
+            signal.signal(signal.SIGTERM, self._on_sigterm)
+
+    def _on_sigterm(self, signum, frame):
+        self.terminated = True
+
+    def stop_requested(self):
+        """True once the deadline has passed or SIGTERM was received."""
+        return self.terminated or (self.deadline is not None and time.time() >= self.deadline)
+
+    def due(self, score):
+        """True if a solution with this score should be saved now (better, and the interval has passed)."""
+        return (self.output_file is not None and score > self.saved_score
+                and time.time() - self.last_save >= self.interval)
+
+    def save(self, score, moves):
+        """Atomically write the solution to the output file if it beats the one already there."""
+        if self.output_file is None or score <= self.saved_score:
+            return
+        directory = os.path.dirname(self.output_file) or '.'
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+            engine.print_solution(moves, score, file=f)
+        # temporary files are private by default; the output should look like any other
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, self.output_file)
+        self.saved_score = score
+        self.last_save = time.time()
+
+
+def run_with_grace(command, input_text, timeout, grace=5.0):
+    """
+    Run command with input_text on stdin. At timeout it gets SIGTERM (which anytime solvers answer by
+    printing their best so far) and is only killed if it's still running grace seconds later.
+    Returns (returncode, stdout, stderr, timed_out).
+    """
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True)
+    try:
+        stdout, stderr = process.communicate(input_text, timeout=timeout)
+        return process.returncode, stdout, stderr, False
+    except subprocess.TimeoutExpired:
+        process.terminate()
+    try:
+        stdout, stderr = process.communicate(timeout=grace)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, stderr = process.communicate()
+    return process.returncode, stdout, stderr, True
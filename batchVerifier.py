@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Same Game Batch Verifier
+Verifies every candidate output we have for each input (Outputs1..N, outputs13, OutputsCustom,
+externOutputs, bestOutputs) in one pass. Each input grid is read once and checked against all of its
+candidates, inputs can be spread over a process pool, and the results can be written out as a JSON or
+CSV report of validity and score per output file.
+
+Outputs for the same input often start with the same moves (eg. the scan-order solvers), so by
+default they're checked together with verify.verify_many, which replays each shared prefix once.
+"""
+
+import csv
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import verify
+
+suffixes = [1062, 1063, 1064, 1065, 1066, 1067, 1068, 1069, 1070, 1071, 1072, 1073, 1074, 1075, 1076, 1077, 1078, 1079,
+            1080, 1081, 1082, 1083, 1084, 1085, 1086, 1087, 1088, 1089, 1090, 1091, 1092, 1093, 1094, 1095, 1096, 1097,
+            1098, 1099, 1100, 1101, 1102, 1103, 1128]
+
+# where each family of output files lives, as (source name, path pattern) with {suffix} filled in
+sources = [
+    ('outputs13', 'outputs13/input_group{suffix}_output.txt'),
+    ('custom', 'OutputsCustom/Custom{suffix}.txt'),
+    ('extern', 'externOutputs/output_group{suffix}.txt'),
+    ('best', 'bestOutputs/{suffix}.txt'),
+]
+
+REPORT_FIELDS = ['input', 'source', 'output', 'valid', 'score', 'message']
+
+
+def candidate_files(suffix):
+    """Every existing output file for an input, as (source name, path) pairs."""
+    candidates = []
+    # OutputsN/ directories, in solver order
+    numbered = []
+    for directory in glob.glob('Outputs*'):
+        match = re.fullmatch(r'Outputs(\d+)', directory)
+        if match:
+            numbered.append((int(match.group(1)), directory))
+    for number, directory in sorted(numbered):
+        candidates.append((f'solver{number}', os.path.join(directory, f'{suffix}.txt')))
+    for name, pattern in sources:
+        candidates.append((name, pattern.format(suffix=suffix)))
+    return [(name, path) for name, path in candidates if os.path.isfile(path)]
+
+
+def verify_input(suffix, candidates, share_prefixes=True):
+    """
+    Read one input and verify each (source name, output file) candidate against it.
+    Returns (report rows as dicts with REPORT_FIELDS keys, moves replayed, moves in all candidates).
+    """
+    input_file = f'Inputs/input_group{suffix}.txt'
+    try:
+        r, c, grid = verify.read_input(input_file)
+    except Exception as e:
+        message = f"Error reading input: {str(e)}"
+        return [row_for(suffix, name, path, False, 0, message) for name, path in candidates], 0, 0
+
+    rows = {}
+    parsed = []
+    for n, (name, path) in enumerate(candidates):
+        try:
+            parsed.append((n, verify.read_output(path)))
+        except ValueError as e:
+            # same message as verify.verify_solution gives for a malformed output
+            rows[n] = row_for(suffix, name, path, False, 0, f"Malformed output: {str(e)}")
+        except Exception as e:
+            rows[n] = row_for(suffix, name, path, False, 0, f"Error during verification: {str(e)}")
+
+    outputs = [output for _, output in parsed]
+    total = sum(len(moves) for _, moves in outputs)
+    if share_prefixes:
+        results, played = verify.verify_many(r, c, grid, outputs)
+    else:
+        results = [verify.verify_moves(r, c, grid, claimed_score, moves, verbose=False)
+                   for claimed_score, moves in outputs]
+        played = total
+    for (n, _), (is_valid, score, message) in zip(parsed, results):
+        name, path = candidates[n]
+        rows[n] = row_for(suffix, name, path, is_valid, score, message)
+
+    return [rows[n] for n in range(len(candidates))], played, total
+
+
+def row_for(suffix, name, path, is_valid, score, message):
+    return {'input': suffix, 'source': name, 'output': path, 'valid': is_valid, 'score': score, 'message': message}
+
+
+def verify_all(suffix_list, jobs=1, share_prefixes=True):
+    """
+    Verify every candidate output of every input.
+    Returns (report rows grouped by input, moves replayed, moves in all candidates).
+    """
+    work = [(suffix, candidate_files(suffix), share_prefixes) for suffix in suffix_list]
+    if jobs <= 1:
+        results = [verify_input(*job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(verify_input, *zip(*work)))
+    rows = [row for input_rows, _, _ in results for row in input_rows]
+    return rows, sum(result[1] for result in results), sum(result[2] for result in results)
+
+
+def best_per_input(rows):
+    """{input: best valid row}, ties going to the first candidate listed."""
+    best = {}
+    for row in rows:
+        if row['valid'] and (row['input'] not in best or row['score'] > best[row['input']]['score']):
+            best[row['input']] = row
+    return best
+
+
+def write_report(rows, report_file):
+    """Write rows as JSON or CSV, depending on the file extension."""
+    with open(report_file, 'w', newline='') as f:
+        if report_file.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+            f.write('\n')
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verify every candidate output for each input in one pass')
+    parser.add_argument('--inputs', type=int, nargs='+', default=suffixes, help='Input suffixes to check')
+    parser.add_argument('--jobs', type=int, default=1, help='Processes to spread the inputs over (default: 1)')
+    parser.add_argument('--report', default=None, help='Write a report to this .json or .csv file')
+    parser.add_argument('--no-prefix-sharing', action='store_true',
+                        help="Replay every output from the start instead of sharing common move prefixes")
+    parser.add_argument('--quiet', action='store_true', help="Only print invalid outputs and the summary")
+
+    args = parser.parse_args()
+
+    start = time.time()
+    rows, played, total = verify_all(args.inputs, args.jobs, not args.no_prefix_sharing)
+    elapsed = time.time() - start
+
+    invalid = [row for row in rows if not row['valid']]
+    for row in rows:
+        if not row['valid']:
+            print(f"{row['output']}: INVALID, {row['message']}")
+        elif not args.quiet:
+            print(f"{row['output']}: {row['score']}")
+
+    best = best_per_input(rows)
+    if not args.quiet:
+        print()
+        for suffix in args.inputs:
+            if suffix in best:
+                print(f"Best solution for suffix: {suffix} is {best[suffix]['output']} with score {best[suffix]['score']}")
+            else:
+                print(f"No valid solution for suffix: {suffix}")
+
+    print(f"\nChecked {len(rows)} outputs for {len(args.inputs)} inputs in {elapsed:.2f}s, {len(invalid)} invalid")
+    print(f"Replayed {played} of {total} moves")
+
+    if args.report:
+        write_report(rows, args.report)
+        print(f"Report saved to: {args.report}")
+
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Same Game Column Board
+Board stored as one list per column, bottom square first. Gravity is just dropping the removed
+squares from the columns they were in (nothing above them has to be moved square by square), and an
+emptied column is a single `del`, so a move costs time in the columns it touches rather than in the
+whole board.
+
+A square is addressed as (col, height): its column, counted from the left, and how many squares sit
+below it. That's also what the output format wants, 1-indexed: row from the bottom = height + 1 and
+column = col + 1. first_move scans the board in any of the first-found solvers' orders (rows from
+the top or bottom, columns from the left or right, row by row or column by column) and clicks the
+first square that has a partner; it never visits the empty squares above the columns.
+"""
+
+from collections import Counter, deque
+
+import engine
+import instrument
+
+
+class ColumnBoard:
+    def __init__(self, rows, cols, columns):
+        self.rows = rows
+        self.cols = cols
+        self.columns = columns
+
+    @classmethod
+    def from_grid(cls, rows, cols, grid):
+        columns = [[grid[row][col] for row in range(rows - 1, -1, -1)] for col in range(cols)]
+        return cls(rows, cols, columns)
+
+    def copy(self):
+        return self.__class__(self.rows, self.cols, [column[:] for column in self.columns])
+
+    def output_position(self, col, height):
+        """The 1-indexed (row from bottom, col from left) output format."""
+        return height + 1, col + 1
+
+    def has_partner(self, col, height):
+        """True if the square at (col, height) has a neighbor of the same color."""
+        columns = self.columns
+        column = columns[col]
+        color = column[height]
+        if (height + 1 < len(column) and column[height + 1] == color) or (height and column[height - 1] == color):
+            return True
+        if col:
+            left = columns[col - 1]
+            if height < len(left) and left[height] == color:
+                return True
+        if col + 1 < len(columns):
+            right = columns[col + 1]
+            if height < len(right) and right[height] == color:
+                return True
+        return False
+
+    def find_connected_component(self, col, height):
+        """All (col, height) squares connected to (col, height) with the same color, that square first."""
+        columns = self.columns
+        color = columns[col][height]
+        start = (col, height)
+        seen = {start}
+        component = [start]
+        queue = deque(component)
+        while queue:
+            c, h = queue.popleft()
+            for nc, nh in ((c, h + 1), (c, h - 1), (c - 1, h), (c + 1, h)):
+                if (nc, nh) in seen or nc < 0 or nh < 0 or nc >= len(columns):
+                    continue
+                column = columns[nc]
+                if nh < len(column) and column[nh] == color:
+                    seen.add((nc, nh))
+                    component.append((nc, nh))
+                    queue.append((nc, nh))
+        return component
+
+    def make_move(self, col, height, component=None):
+        """Build the move dict for clicking (col, height)."""
+        if component is None:
+            component = self.find_connected_component(col, height)
+        size = len(component)
+        return {
+            'component': component,
+            'color': self.columns[col][height],
+            'size': size,
+            'score': (size - 1) ** 2,
+            'pos': (col, height)
+        }
+
+    def first_move(self, rows_reversed=False, cols_reversed=False, column_major=False):
+        """
+        The move for the first clickable square in the given scan order, or None. By default rows go
+        from the top down and columns from the left, row by row; the flags flip each of those.
+        Only squares that exist are visited: nothing above a column's top or right of the last column.
+        """
+        columns = self.columns
+        has_partner = self.has_partner
+        col_range = range(len(columns) - 1, -1, -1) if cols_reversed else range(len(columns))
+        if column_major:
+            for col in col_range:
+                height = len(columns[col])
+                for height in (range(height) if rows_reversed else range(height - 1, -1, -1)):
+                    if has_partner(col, height):
+                        return self.make_move(col, height)
+        else:
+            tallest = max(map(len, columns), default=0)
+            for height in (range(tallest) if rows_reversed else range(tallest - 1, -1, -1)):
+                for col in col_range:
+                    if height < len(columns[col]) and has_partner(col, height):
+                        return self.make_move(col, height)
+        return None
+
+    def remove(self, component):
+        """
+        Remove the squares in component: each touched column keeps everything but the removed squares
+        (which is the gravity), then emptied columns are deleted (which is the left shift).
+        """
+        removed = {}
+        for col, height in component:
+            removed.setdefault(col, set()).add(height)
+        columns = self.columns
+        for col, heights in removed.items():
+            column = columns[col]
+            low = min(heights)
+            # squares below the lowest removed one stay where they are
+            columns[col] = column[:low] + [color for height, color in enumerate(column[low:], low)
+                                           if height not in heights]
+        for col in sorted(removed, reverse=True):
+            if not columns[col]:
+                del columns[col]
+
+    def apply_move(self, move):
+        """Apply a move dict and return its [color, size, row, col] output record."""
+        row, col = self.output_position(*move['pos'])
+        self.remove(move['component'])
+        return [move['color'], move['size'], row, col]
+
+
+def _gravity_before(board, component):
+    """Which columns a removal drops squares in and which it empties (for the gravity counters)."""
+    per_col = Counter(col for col, height in component)
+    emptied = [col for col, n in per_col.items() if len(board.columns[col]) == n]
+    return len(board.columns), len(per_col), emptied
+
+
+if instrument.enabled:
+    instrument.wrap(ColumnBoard, 'find_connected_component', 'flood fill',
+                    tally=lambda args, result, state: {'squares flooded': len(result)})
+    instrument.wrap(ColumnBoard, 'first_move', 'first move scan')
+    instrument.wrap(ColumnBoard, 'remove', 'gravity', before=_gravity_before, tally=engine._gravity_tally)
@@ -0,0 +1,170 @@
+"""
+Same Game Component Index
+Keeps the connected components of an engine.Board up to date as moves are applied, instead of
+rescanning the whole board after every click.
+
+After a move only the columns the board reports as changed (the removed group's column span, plus
+everything right of it if columns shifted left), at or above the lowest removed square, can hold
+different squares. Any group with a square in
+those columns or the columns next to them is dropped and flooded again; every other group keeps its
+label, size and position. Candidate moves sit in a max-heap keyed on (size, first square) with stale
+entries skipped lazily. Clickable groups are also kept in a flat list, so random playouts can pick
+a move uniformly without looking at the others.
+"""
+
+import heapq
+
+import instrument
+from engine import EMPTY
+
+
+class ComponentIndex:
+    def __init__(self, board):
+        self.board = board
+        # label of the group each square belongs to (0 for empty squares)
+        self.labels = [0] * len(board.cells)
+        # label -> move dict (component, color, size, score, pos), for groups of every size
+        self.groups = {}
+        self.heap = []
+        # labels of every clickable group (size 2+), and each one's position in that list, so a
+        # uniformly random move can be picked without scanning the groups
+        self.legal = []
+        self.slot = {}
+        # total score of every group that could be clicked right now
+        self.potential = 0
+        self.next_label = 1
+        self.relabeled = 0
+        self._label_squares(range(len(board.cells)))
+
+    def copy(self):
+        """Independent index over a copy of the board. Group dicts are never mutated, so they're shared."""
+        index = self.__class__.__new__(self.__class__)
+        index.__dict__.update(self.__dict__)
+        index.board = self.board.copy()
+        index.labels = self.labels[:]
+        index.groups = dict(self.groups)
+        index.heap = self.heap[:]
+        index.legal = self.legal[:]
+        index.slot = dict(self.slot)
+        return index
+
+    def _label_squares(self, squares):
+        """Flood every unlabeled, non-empty square in squares into a new group."""
+        board = self.board
+        cells = board.cells
+        labels = self.labels
+        seen = bytearray(len(cells))
+        for idx in squares:
+            if labels[idx] or seen[idx] or cells[idx] == EMPTY:
+                continue
+            component = board._flood(idx, seen)
+            label = self.next_label
+            self.next_label += 1
+            for square in component:
+                labels[square] = label
+            # report the group from its first square in row-major order, like Board.iter_moves
+            pos = min(component)
+            size = len(component)
+            self.groups[label] = {
+                'component': component,
+                'color': cells[pos],
+                'size': size,
+                'score': (size - 1) ** 2,
+                'pos': pos
+            }
+            self.relabeled += size
+            if size >= 2:
+                self.potential += (size - 1) ** 2
+                heapq.heappush(self.heap, (-size, pos, label))
+                self.slot[label] = len(self.legal)
+                self.legal.append(label)
+
+    def update(self, first_col, last_col, last_row=None):
+        """
+        Relabel after the board changed in columns first_col..last_col (as returned by Board.remove).
+        Gravity only moves squares at or above the lowest removed square, so when no columns shifted
+        the caller can pass that row as last_row and nothing below it is touched.
+        """
+        board = self.board
+        rows, cols = board.rows, board.cols
+        labels = self.labels
+        groups = self.groups
+        if last_row is None:
+            last_row = rows - 1
+        lo = max(first_col - 1, 0)
+        hi = min(last_col + 1, cols - 1)
+        below = min(last_row + 1, rows - 1)
+
+        # labels still describe the board before the move, so this finds every group that touched
+        # the changed squares or could now merge with something in them
+        stale = set()
+        for col in range(lo, hi + 1):
+            stale.update(labels[col:(below + 1) * cols:cols])
+        stale.discard(0)
+
+        to_flood = []
+        for label in stale:
+            group = groups.pop(label)
+            if group['size'] >= 2:
+                self.potential -= group['score']
+                self._drop_legal(label)
+            for square in group['component']:
+                labels[square] = 0
+                to_flood.append(square)
+        cleared = [0] * (last_row + 1)
+        for col in range(first_col, last_col + 1):
+            labels[col:(last_row + 1) * cols:cols] = cleared
+            to_flood.extend(range(col, (last_row + 1) * cols, cols))
+        self._label_squares(to_flood)
+
+        if len(self.heap) > 4 * len(groups) + 64:
+            self.heap = [entry for entry in self.heap if entry[2] in groups]
+            heapq.heapify(self.heap)
+
+    def _drop_legal(self, label):
+        """Swap label out of the legal list."""
+        legal, slot = self.legal, self.slot
+        position = slot.pop(label)
+        last = legal.pop()
+        if last != label:
+            legal[position] = last
+            slot[last] = position
+
+    def remove(self, component):
+        """Remove a group's squares from the board (applying gravity) and update the index."""
+        board = self.board
+        width = board.width
+        last_row = max(component) // board.cols
+        first_col, last_col = board.remove(component)
+        self.update(first_col, last_col, last_row if board.width == width else None)
+
+    def apply_move(self, move):
+        """Apply a move dict and return its [color, size, row, col] output record."""
+        row, col = self.board.output_position(move['pos'])
+        self.remove(move['component'])
+        return [move['color'], move['size'], row, col]
+
+    def largest(self):
+        """The biggest group (ties go to the first in row-major order), or None if no moves are left."""
+        heap = self.heap
+        while heap and heap[0][2] not in self.groups:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return self.groups[heap[0][2]]
+
+    def random_move(self, rng):
+        """A uniformly random legal move (every group equally likely), or None if no moves are left."""
+        legal = self.legal
+        if not legal:
+            return None
+        return self.groups[legal[rng.randrange(len(legal))]]
+
+    def moves(self):
+        """Every legal move, in no particular order."""
+        return [move for move in self.groups.values() if move['size'] >= 2]
+
+
+if instrument.enabled:
+    instrument.wrap(ComponentIndex, 'update', 'relabel', before=lambda index, *args: index.relabeled,
+                    tally=lambda args, result, relabeled: {'squares relabeled': args[0].relabeled - relabeled})
@@ -0,0 +1,367 @@
+"""
+Same Game Engine
+Shared board representation, component search and gravity used by every solver and by verify.py.
+
+The board is a flat list of colors in row-major order with row 0 at the top (the same orientation
+as the input file). Empty squares are -1. Square (row, col) lives at index row * cols + col.
+"""
+
+import sys
+from collections import Counter, deque
+
+import instrument
+
+EMPTY = -1
+
+
+class Board:
+    def __init__(self, rows, cols, cells):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        # columns at or right of width are known to be empty
+        self.width = cols
+        # Zobrist keys (see zobrist.py) and the board's hash under them, kept up to date by remove()
+        self.keys = None
+        self.hash = 0
+
+    @classmethod
+    def from_grid(cls, rows, cols, grid):
+        return cls(rows, cols, [color for row in grid for color in row])
+
+    def copy(self):
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.cells = self.cells[:]
+        return board
+
+    def set_keys(self, keys):
+        """Start keeping self.hash up to date under keys ({color: [key per square]})."""
+        self.keys = keys
+        self.hash = self.compute_hash()
+
+    def compute_hash(self):
+        """Zobrist hash of the whole board (XOR of the key of every non-empty square's color)."""
+        keys = self.keys
+        h = 0
+        for idx, color in enumerate(self.cells):
+            if color != EMPTY:
+                h ^= keys[color][idx]
+        return h
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def output_position(self, idx):
+        """Convert a flat index to the 1-indexed (row from bottom, col from left) output format."""
+        row, col = divmod(idx, self.cols)
+        return self.rows - row, col + 1
+
+    def has_partner(self, idx):
+        """True if the square at idx has a neighbor of the same color (ie. clicking it is legal)."""
+        cells = self.cells
+        color = cells[idx]
+        if color == EMPTY:
+            return False
+        cols = self.cols
+        col = idx % cols
+        return ((idx >= cols and cells[idx - cols] == color)
+                or (idx + cols < len(cells) and cells[idx + cols] == color)
+                or (col != 0 and cells[idx - 1] == color)
+                or (col != cols - 1 and cells[idx + 1] == color))
+
+    def _flood(self, idx, seen):
+        """BFS from idx, marking squares in seen. Returns the component with idx first."""
+        cells = self.cells
+        cols = self.cols
+        n = len(cells)
+        color = cells[idx]
+        seen[idx] = 1
+        component = [idx]
+        queue = deque(component)
+        while queue:
+            cur = queue.popleft()
+            col = cur % cols
+            for nxt in (cur - cols if cur >= cols else -1,
+                        cur + cols if cur + cols < n else -1,
+                        cur - 1 if col != 0 else -1,
+                        cur + 1 if col != cols - 1 else -1):
+                if nxt != -1 and not seen[nxt] and cells[nxt] == color:
+                    seen[nxt] = 1
+                    component.append(nxt)
+                    queue.append(nxt)
+        return component
+
+    def find_connected_component(self, idx):
+        """All squares connected to idx with the same color (idx first), or [] if idx is empty."""
+        if self.cells[idx] == EMPTY:
+            return []
+        return self._flood(idx, bytearray(len(self.cells)))
+
+    def make_move(self, idx, component=None):
+        """Build the move dict for clicking idx."""
+        if component is None:
+            component = self.find_connected_component(idx)
+        size = len(component)
+        return {
+            'component': component,
+            'color': self.cells[idx],
+            'size': size,
+            'score': (size - 1) ** 2,
+            'pos': idx
+        }
+
+    def iter_moves(self):
+        """Yield every legal move, ordered by the row-major position of its first square."""
+        cells = self.cells
+        seen = bytearray(len(cells))
+        for idx in range(len(cells)):
+            if seen[idx] or cells[idx] == EMPTY:
+                continue
+            if not self.has_partner(idx):
+                continue
+            yield self.make_move(idx, self._flood(idx, seen))
+
+    def find_all_moves(self):
+        """Find all valid moves (same moves and order as iter_moves, but from one labeling pass)"""
+        return find_all_moves_labeled(self)
+
+    def remove(self, component):
+        """
+        Remove the squares in component and apply gravity
+        1. Drop squares down within each touched column
+        2. Shift columns left if any become empty
+        Returns the (first, last) columns whose contents changed.
+        If Zobrist keys are set, self.hash is updated for just the squares that changed.
+        """
+        cells = self.cells
+        rows, cols = self.rows, self.cols
+        keys = self.keys
+        h = self.hash
+        touched = set()
+        for idx in component:
+            if keys is not None:
+                h ^= keys[cells[idx]][idx]
+            cells[idx] = EMPTY
+            touched.add(idx % cols)
+        first_col, last_col = min(touched), max(touched)
+
+        # nothing below the lowest removed square moves, so gravity only rewrites rows 0..last_row
+        end = (max(component) // cols + 1) * cols
+        bottom = (rows - 1) * cols
+        emptied = False
+        not_empty = EMPTY.__ne__
+        for col in touched:
+            column = cells[col:end:cols]
+            kept = list(filter(not_empty, column))
+            dropped = [EMPTY] * (len(column) - len(kept)) + kept
+            cells[col:end:cols] = dropped
+            if cells[bottom + col] == EMPTY:
+                emptied = True
+            elif keys is not None:
+                # only squares that fell change the hash
+                for row in range(len(column)):
+                    old, new = column[row], dropped[row]
+                    if old != new:
+                        idx = row * cols + col
+                        if old != EMPTY:
+                            h ^= keys[old][idx]
+                        if new != EMPTY:
+                            h ^= keys[new][idx]
+
+        if emptied:
+            empty_column = [EMPTY] * rows
+            write_col = 0
+            for read_col in range(self.width):
+                if cells[bottom + read_col] != EMPTY:
+                    if write_col != read_col:
+                        column = cells[read_col::cols]
+                        cells[write_col::cols] = column
+                        cells[read_col::cols] = empty_column
+                        if keys is not None:
+                            for row, color in enumerate(column):
+                                if color != EMPTY:
+                                    idx = row * cols
+                                    h ^= keys[color][idx + read_col] ^ keys[color][idx + write_col]
+                    write_col += 1
+            # everything right of the first emptied column moved
+            last_col = self.width - 1
+            self.width = write_col
+
+        self.hash = h
+        return first_col, last_col
+
+    def apply_move(self, move):
+        """Apply a move dict and return its [color, size, row, col] output record."""
+        row, col = self.output_position(move['pos'])
+        self.remove(move['component'])
+        return [move['color'], move['size'], row, col]
+
+
+def label_components(board):
+    """
+    Label every group on the board.
+    Returns (labels, sizes, colors): labels[idx] is the group of square idx (-1 for empty squares),
+    and sizes[label] / colors[label] describe group label. Labels are numbered in row-major order of
+    each group's first square.
+    """
+    cells = board.cells
+    cols = board.cols
+    n = len(cells)
+    parent = []
+    provisional = [-1] * n
+
+    # pass 1: give each square its left or upper neighbor's label, merging the two when both match
+    for idx in range(n):
+        color = cells[idx]
+        if color == EMPTY:
+            continue
+        up = provisional[idx - cols] if idx >= cols and cells[idx - cols] == color else -1
+        left = provisional[idx - 1] if idx % cols and cells[idx - 1] == color else -1
+        if up == -1 and left == -1:
+            provisional[idx] = len(parent)
+            parent.append(len(parent))
+        elif left == -1 or up == left:
+            provisional[idx] = up
+        elif up == -1:
+            provisional[idx] = left
+        else:
+            # find both roots (with path halving) and hang the newer one under the older one
+            while parent[up] != up:
+                parent[up] = parent[parent[up]]
+                up = parent[up]
+            while parent[left] != left:
+                parent[left] = parent[parent[left]]
+                left = parent[left]
+            if up < left:
+                parent[left] = up
+            elif left < up:
+                parent[up] = left
+            provisional[idx] = up if up < left else left
+
+    # flatten: every provisional label points at its root, then number roots in order
+    final = [0] * len(parent)
+    sizes = []
+    colors = []
+    for label in range(len(parent)):
+        root = parent[label]
+        if root == label:
+            final[label] = len(sizes)
+            sizes.append(0)
+            colors.append(None)
+        else:
+            # roots are always older than their children, so parent[root] is already final
+            parent[label] = parent[root]
+            final[label] = final[parent[label]]
+
+    # pass 2: rewrite provisional labels and count group sizes
+    labels = [-1] * n
+    for idx in range(n):
+        label = provisional[idx]
+        if label != -1:
+            label = final[label]
+            labels[idx] = label
+            sizes[label] += 1
+            colors[label] = cells[idx]
+    return labels, sizes, colors
+
+
+def find_all_moves_labeled(board):
+    """Every legal move in row-major order of its first square, built from one labeling pass."""
+    labels, sizes, colors = label_components(board)
+    components = [[] for _ in sizes]
+    for idx, label in enumerate(labels):
+        if label != -1 and sizes[label] >= 2:
+            components[label].append(idx)
+    moves = []
+    for label, component in enumerate(components):
+        if component:
+            size = sizes[label]
+            moves.append({
+                'component': component,
+                'color': colors[label],
+                'size': size,
+                'score': (size - 1) ** 2,
+                'pos': component[0]
+            })
+    return moves
+
+
+def color_counts(cells):
+    """{color: number of squares of that color left} (empty squares aren't counted)."""
+    counts = Counter(cells)
+    counts.pop(EMPTY, None)
+    return counts
+
+
+def color_bound(counts):
+    """
+    Upper bound on the score still to be had: every color collapsing into one group, sum of
+    (count - 1) ** 2. Splitting a color into several groups never scores more, since
+    (a - 1) ** 2 + (b - 1) ** 2 <= (a + b - 1) ** 2 for groups of 2 or more.
+    """
+    return sum((n - 1) ** 2 for n in counts.values() if n >= 2)
+
+
+def parse_grid(lines):
+    """Parse the input format (dimensions, then one row of digits per line) into (r, c, grid)."""
+    r, c = map(int, lines[0].split())
+    grid = []
+    for i in range(r):
+        grid.append(list(map(int, lines[i + 1].strip())))
+    return r, c, grid
+
+
+def read_grid():
+    """Read (r, c, grid) from stdin."""
+    sizes = input().split()
+    lines = [' '.join(sizes)] + [input() for _ in range(int(sizes[0]))]
+    return parse_grid(lines)
+
+
+def read_board():
+    """Read a board from stdin."""
+    r, c, grid = read_grid()
+    return Board.from_grid(r, c, grid)
+
+
+def total_score(moves):
+    return sum((move[1] - 1) ** 2 for move in moves)
+
+
+def print_solution(moves, score=None, file=None):
+    """Print a solution in the output format: score, number of moves, then one move per line."""
+    if score is None:
+        score = total_score(moves)
+    print(score, file=file)
+    print(len(moves), file=file)
+    for move in moves:
+        print(f'{move[0]} {move[1]} {move[2]} {move[3]}', file=file)
+
+
+def _gravity_before(board, component):
+    """Which columns a removal drops squares in and which it empties (for the gravity counters)."""
+    cells, cols = board.cells, board.cols
+    per_col = Counter(idx % cols for idx in component)
+    emptied = [col for col, n in per_col.items() if sum(1 for color in cells[col::cols] if color != EMPTY) == n]
+    return board.width, len(per_col), emptied
+
+
+def _gravity_tally(args, result, state):
+    width, dropped, emptied = state
+    return {
+        'squares removed': len(args[1]),
+        'columns dropped': dropped,
+        'columns emptied': len(emptied),
+        # every column right of the first emptied one that still has squares moves left
+        'columns shifted': width - min(emptied) - len(emptied) if emptied else 0
+    }
+
+
+if instrument.enabled:
+    instrument.wrap(Board, '_flood', 'flood fill', tally=lambda args, result, state: {'squares flooded': len(result)})
+    instrument.wrap(Board, 'remove', 'gravity', before=_gravity_before, tally=_gravity_tally)
+    instrument.wrap(sys.modules[__name__], 'label_components', 'labeling pass',
+                    tally=lambda args, result, state: {'squares labeled': len(result[0])})
+    instrument.wrap(sys.modules[__name__], 'parse_grid', 'parse')
+    instrument.wrap(sys.modules[__name__], 'print_solution', 'output')
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Engine Equivalence Test
+Re-runs the solvers on the Inputs/ corpus and checks that they reproduce, move for move, the outputs
+recorded in Outputs1..Outputs11 and outputs13 (which were generated by the original stand-alone
+solver scripts before they were moved onto engine.py).
+
+solver12 is randomized, so it isn't run by default and its outputs are only checked for validity
+when it is asked for with --solvers 12.
+
+With --boards, every input is also played with columnboard.ColumnBoard (which the first-found
+solvers 1-8 use) and engine.Board side by side, in each of the eight first-found scan orders, always
+clicking the first clickable square, and the two boards have to agree on every move (color, group
+size and position) and on the board left after it.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from itertools import product
+
+import columnboard
+import engine
+import verify
+
+suffixes = [1062, 1063, 1064, 1065, 1066, 1067, 1068, 1069, 1070, 1071, 1072, 1073, 1074, 1075, 1076, 1077, 1078, 1079,
+            1080, 1081, 1082, 1083, 1084, 1085, 1086, 1087, 1088, 1089, 1090, 1091, 1092, 1093, 1094, 1095, 1096, 1097,
+            1098, 1099, 1100, 1101, 1102, 1103, 1128]
+
+solvers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13]
+
+
+def expected_output_file(solver, suffix):
+    if solver == 13:
+        return f'outputs13/input_group{suffix}_output.txt'
+    return f'Outputs{solver}/{suffix}.txt'
+
+
+def run_solver(solver, input_file, timeout):
+    with open(input_file, 'r') as f:
+        result = subprocess.run(
+            [sys.executable, f'solver{solver}.py'],
+            stdin=f,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"solver{solver}.py exited with {result.returncode}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def check_random_solver(input_file, output_text):
+    """Randomized solvers can't be compared move for move, so just check the output is valid."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(output_text)
+    try:
+        is_valid, _, message = verify.verify_solution(input_file, f.name, verbose=False)
+    finally:
+        os.unlink(f.name)
+    return None if is_valid else message
+
+
+def check_pair(solver, suffix, timeout):
+    """Returns None if solver reproduces its recorded output for this input, otherwise a description."""
+    input_file = f'Inputs/input_group{suffix}.txt'
+    output_text = run_solver(solver, input_file, timeout)
+
+    if solver == 12:
+        return check_random_solver(input_file, output_text)
+
+    score, moves = verify.parse_output(output_text.splitlines())
+    expected_score, expected_moves = verify.read_output(expected_output_file(solver, suffix))
+
+    for move_num, (move, expected) in enumerate(zip(moves, expected_moves), 1):
+        if move != expected:
+            return f"move {move_num} is {move}, expected {expected}"
+    if len(moves) != len(expected_moves):
+        return f"{len(moves)} moves, expected {len(expected_moves)}"
+    if score != expected_score:
+        return f"score {score}, expected {expected_score}"
+    return None
+
+
+def scan_order(rows, cols, rows_reversed=False, cols_reversed=False, column_major=False):
+    """engine.Board flat indices of every square in a first-found scan order (top-left first by default)."""
+    row_range = range(rows - 1, -1, -1) if rows_reversed else range(rows)
+    col_range = range(cols - 1, -1, -1) if cols_reversed else range(cols)
+    if column_major:
+        return [i * cols + j for j in col_range for i in row_range]
+    return [i * cols + j for i in row_range for j in col_range]
+
+
+def board_columns(board):
+    """An engine.Board's squares as ColumnBoard columns: bottom square first, empty columns left out."""
+    cells, rows, cols = board.cells, board.rows, board.cols
+    columns = []
+    for col in range(cols):
+        column = [cells[row * cols + col] for row in range(rows - 1, -1, -1)]
+        if engine.EMPTY in column:
+            column = column[:column.index(engine.EMPTY)]
+        if column:
+            columns.append(column)
+    return columns
+
+
+def check_boards(suffix, flags):
+    """Returns None if ColumnBoard and engine.Board play this input the same way in this scan order."""
+    r, c, grid = verify.read_input(f'Inputs/input_group{suffix}.txt')
+    column_board = columnboard.ColumnBoard.from_grid(r, c, grid)
+    board = engine.Board.from_grid(r, c, grid)
+    order = scan_order(r, c, *flags)
+    move_num = 0
+    while True:
+        move = column_board.first_move(*flags)
+        idx = next((idx for idx in order if board.has_partner(idx)), None)
+        if move is None or idx is None:
+            if move is not None or idx is not None:
+                return f"after {move_num} moves only one board has a move left"
+            return None
+        move_num += 1
+        record = column_board.apply_move(move)
+        expected = board.apply_move(board.make_move(idx))
+        if record != expected:
+            return f"move {move_num} is {record}, engine.Board's is {expected}"
+        if column_board.columns != board_columns(board):
+            return f"boards differ after move {move_num}"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check solvers reproduce their recorded outputs')
+    parser.add_argument('--solvers', type=int, nargs='*', default=solvers,
+                        help='Solver numbers (default: all deterministic solvers; none to only check --boards)')
+    parser.add_argument('--inputs', type=int, nargs='+', default=suffixes, help='Input suffixes (default: all)')
+    parser.add_argument('--timeout', type=int, default=600, help='Per-run timeout in seconds (default: 600)')
+    parser.add_argument('--boards', action='store_true',
+                        help='Also check columnboard.ColumnBoard plays every input like engine.Board')
+
+    args = parser.parse_args()
+
+    failures = 0
+    for solver in args.solvers:
+        for suffix in args.inputs:
+            try:
+                problem = check_pair(solver, suffix, args.timeout)
+            except Exception as e:
+                problem = str(e)
+            if problem is None:
+                print(f'solver{solver} {suffix}: ok')
+            else:
+                print(f'solver{solver} {suffix}: MISMATCH ({problem})')
+                failures += 1
+
+    if args.boards:
+        for suffix in args.inputs:
+            # (rows_reversed, cols_reversed, column_major) for every scan order
+            for flags in product((False, True), repeat=3):
+                problem = check_boards(suffix, flags)
+                name = ', '.join(label for label, on in zip(('rows reversed', 'cols reversed', 'column major'), flags)
+                                 if on) or 'default order'
+                if problem is None:
+                    print(f'boards {suffix} ({name}): ok')
+                else:
+                    print(f'boards {suffix} ({name}): MISMATCH ({problem})')
+                    failures += 1
+
+    if failures:
+        print(f'\n{failures} mismatches')
+        sys.exit(1)
+    print('\nAll outputs match')
+
+
+if __name__ == "__main__":
+    main()
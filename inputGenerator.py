@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Synthetic Input Generator
+Writes boards in the input format (dimensions, then one row of color digits per line) for scaling
+tests past the ~10k squares of the Inputs/ corpus. Every board is generated from a seeded
+random.Random, so the same arguments always produce the same file.
+
+Styles:
+    uniform       every square an independent random color
+    blobby        each square copies its upper or left neighbor with probability --clustering,
+                  which grows large single-color regions (big early groups, like the friendlier inputs)
+    checkerboard  colors cycle along the diagonals so no two neighbors match, with --noise of the
+                  squares recolored at random; almost every move is a pair
+    skinny        uniform colors on a 2-column board, like the 5000x2 input
+
+With --cells, one board per size is written to --output-dir, named <style>_<rows>x<cols>_s<seed>.txt,
+so a whole directory can be handed to solverBenchmark.py to chart runtime against board size.
+"""
+
+import math
+import os
+import random
+
+styles = ['uniform', 'blobby', 'checkerboard', 'skinny']
+
+
+def generate(rows, cols, colors, style, seed=0, clustering=0.6, noise=0.02):
+    """A rows x cols grid (list of rows) of colors 1..colors in the given style."""
+    rng = random.Random(seed)
+    grid = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            if style == 'blobby' and rng.random() < clustering and (i or j):
+                if i and j:
+                    color = grid[i - 1][j] if rng.random() < 0.5 else row[j - 1]
+                else:
+                    color = grid[i - 1][j] if i else row[j - 1]
+            elif style == 'checkerboard' and rng.random() >= noise:
+                color = (i + j) % colors + 1
+            else:
+                color = rng.randint(1, colors)
+            row.append(color)
+        grid.append(row)
+    return grid
+
+
+def shape_for(cells, style):
+    """(rows, cols) for a board of about this many squares: 2 columns for skinny, square otherwise."""
+    if style == 'skinny':
+        return max(cells // 2, 1), 2
+    side = max(round(math.sqrt(cells)), 1)
+    return side, side
+
+
+def write_grid(path, grid):
+    with open(path, 'w') as f:
+        f.write(f'{len(grid)} {len(grid[0])}\n')
+        for row in grid:
+            f.write(''.join(map(str, row)) + '\n')
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate seeded synthetic Same Game inputs')
+    parser.add_argument('--style', choices=styles, default='uniform', help='Board style (default: uniform)')
+    parser.add_argument('--rows', type=int, default=None, help='Board height')
+    parser.add_argument('--cols', type=int, default=None, help='Board width (default: 2 for skinny)')
+    parser.add_argument('--cells', type=int, nargs='+', default=None,
+                        help='Write one board per size instead (square, or 2 columns for skinny)')
+    parser.add_argument('--colors', type=int, default=4, help='Number of colors, 1-9 (default: 4)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--clustering', type=float, default=0.6,
+                        help='Chance a blobby square copies a neighbor (default: 0.6)')
+    parser.add_argument('--noise', type=float, default=0.02,
+                        help='Fraction of checkerboard squares recolored at random (default: 0.02)')
+    parser.add_argument('-o', '--output', default=None, help='Output file for a single board (default: stdout)')
+    parser.add_argument('--output-dir', default='Synthetic', help='Directory for --cells boards (default: Synthetic)')
+
+    args = parser.parse_args()
+
+    if not 1 <= args.colors <= 9:
+        parser.error('--colors must be between 1 and 9 (colors are single digits)')
+
+    if args.cells:
+        shapes = [shape_for(cells, args.style) for cells in args.cells]
+    else:
+        cols = args.cols if args.cols is not None else (2 if args.style == 'skinny' else None)
+        if args.rows is None or cols is None:
+            parser.error('give --rows and --cols, or --cells')
+        shapes = [(args.rows, cols)]
+
+    for rows, cols in shapes:
+        grid = generate(rows, cols, args.colors, args.style, args.seed, args.clustering, args.noise)
+        if args.cells:
+            os.makedirs(args.output_dir, exist_ok=True)
+            path = os.path.join(args.output_dir, f'{args.style}_{rows}x{cols}_s{args.seed}.txt')
+            write_grid(path, grid)
+            print(f"Wrote {path}")
+        elif args.output:
+            write_grid(args.output, grid)
+        else:
+            print(f'{rows} {cols}')
+            for row in grid:
+                print(''.join(map(str, row)))
+
+
+if __name__ == "__main__":
+    main()
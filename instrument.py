@@ -0,0 +1,103 @@
+"""
+Same Game Instrumentation
+Optional counters and cumulative timers for the hot paths (flood fills, labeling passes, gravity,
+first-move scans, parsing and output), to see where a solver's time actually goes before
+optimizing it.
+
+Turned on with the SAMEGAME_STATS environment variable, eg.
+
+    SAMEGAME_STATS=1 python solver13.py < Inputs/input_group1082.txt > /dev/null
+    SAMEGAME_STATS=stats.json python solver5.py < Inputs/input_group1082.txt > /dev/null
+
+With 1 (or stderr) the totals are printed to stderr at exit, anything else is taken as a JSON file
+to write them to. When it's off nothing is wrapped, so the hot paths run exactly as before; modules
+declare their instrumentation points with wrap() behind an `if instrument.enabled:` check. When it's
+on, the timers include the wrappers' own overhead, so compare them with each other rather than with
+an uninstrumented run. Timers nest: a relabel's time includes the flood fills it does.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+setting = os.environ.get('SAMEGAME_STATS', '')
+enabled = setting not in ('', '0')
+
+# name -> cumulative total (squares flooded, columns shifted, ...)
+counters = Counter()
+# name -> [calls, seconds] for every wrapped function and phase
+timers = defaultdict(lambda: [0, 0.0])
+
+
+def count(name, n=1):
+    counters[name] += n
+
+
+def wrap(owner, attr, name, before=None, tally=None):
+    """
+    Replace owner.attr (a function or method) with a version that times every call under name.
+    before(*args) runs ahead of the call, and tally(args, result, before_value) returns a dict of
+    extra counts to add once it's done.
+    """
+    func = getattr(owner, attr)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        state = before(*args) if before is not None else None
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timer = timers[name]
+        timer[0] += 1
+        timer[1] += time.perf_counter() - start
+        if tally is not None:
+            counters.update(tally(args, result, state))
+        return result
+
+    setattr(owner, attr, wrapper)
+
+
+@contextlib.contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer = timers[name]
+        timer[0] += 1
+        timer[1] += time.perf_counter() - start
+
+
+def phase(name):
+    """Context manager timing a block under name (does nothing when instrumentation is off)."""
+    return _timed(name) if enabled else contextlib.nullcontext()
+
+
+def snapshot():
+    return {
+        'timers': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in sorted(timers.items())},
+        'counters': dict(sorted(counters.items()))
+    }
+
+
+def report():
+    """Print the totals to stderr or write them to the JSON file named by SAMEGAME_STATS."""
+    if setting in ('1', 'stderr'):
+        print(f"{'Timer':<30} {'Calls':>10} {'Seconds':>9}", file=sys.stderr)
+        for name, (calls, seconds) in sorted(timers.items(), key=lambda item: -item[1][1]):
+            print(f"{name:<30} {calls:>10} {seconds:>9.3f}", file=sys.stderr)
+        print(f"{'Counter':<30} {'Total':>10}", file=sys.stderr)
+        for name, total in sorted(counters.items()):
+            print(f"{name:<30} {total:>10}", file=sys.stderr)
+    else:
+        with open(setting, 'w') as f:
+            json.dump(snapshot(), f, indent=2)
+            f.write('\n')
+
+
+if enabled:
+    atexit.register(report)
@@ -0,0 +1,76 @@
+"""
+Same Game Playout Kernel
+Fast random playouts for the restart solvers. The board and its component index are built once as a
+template; each playout starts from a copy of it (one flat copy of the squares and labels, no
+relabeling), then keeps clicking a uniformly random legal group, taken straight from the index's
+list of clickable groups, until none are left.
+
+Given an incumbent score, a playout also keeps engine.color_bound up to date move by move and is
+abandoned (cut) as soon as its score so far plus that bound can't beat the incumbent. The time saved
+is estimated from how long the playouts that ran to the end took on average.
+"""
+
+import time
+
+import components
+import engine
+
+
+class PlayoutKernel:
+    def __init__(self, r, c, grid):
+        self.template = components.ComponentIndex(engine.Board.from_grid(r, c, grid))
+        self.counts = engine.color_counts(self.template.board.cells)
+        self.playouts = 0
+        self.seconds = 0.0
+        self.cuts = 0
+        self.cut_seconds = 0.0
+
+    def playout(self, rng, stop=None, incumbent=None):
+        """
+        One random playout from the starting board, as (score, moves).
+        If stop is given it is checked before every move; the moves played so far are still valid.
+        If incumbent is given the playout is cut once it can no longer score more than incumbent (it
+        still returns the valid moves played so far).
+        """
+        start = time.perf_counter()
+        index = self.template.copy()
+        moves = []
+        score = 0
+        cut = False
+        if incumbent is not None:
+            counts = dict(self.counts)
+            bound = engine.color_bound(counts)
+            cut = bound <= incumbent
+        while not cut and (stop is None or not stop()):
+            move = index.random_move(rng)
+            if move is None:
+                break
+            moves.append(index.apply_move(move))
+            score += move['score']
+            if incumbent is not None:
+                color = move['color']
+                n = counts[color]
+                left = n - move['size']
+                counts[color] = left
+                bound -= (n - 1) ** 2 - ((left - 1) ** 2 if left >= 2 else 0)
+                # a playout that just ran out of moves finished rather than being cut
+                cut = score + bound <= incumbent and bool(index.legal)
+        seconds = time.perf_counter() - start
+        self.playouts += 1
+        self.seconds += seconds
+        if cut:
+            self.cuts += 1
+            self.cut_seconds += seconds
+        return score, moves
+
+    def rate(self):
+        """Playouts per second so far."""
+        return self.playouts / self.seconds if self.seconds else 0.0
+
+    def saved_seconds(self):
+        """Estimated time the cuts saved: what the cut playouts would have taken at the average full length."""
+        full = self.playouts - self.cuts
+        if not full:
+            return 0.0
+        average = (self.seconds - self.cut_seconds) / full
+        return self.cuts * average - self.cut_seconds
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Same Game Portfolio Runner
+Races every solver on every input and keeps the best valid output per input in bestOutputs/.
+
+Each (solver, input) pair is its own job: a worker thread starts the solver as a separate Python
+process and waits for it, so the pool runs as many solvers at once as there are workers (one per CPU
+by default) and a job that overruns its timeout is simply killed. Results are reported as they
+finish; an output only replaces the current best for its input after it passes verify.py and beats
+the best score so far (including whatever is already in bestOutputs/, unless --fresh is given).
+
+Every valid result is also recorded in the results store (results.py) along with the solver's
+arguments and, for the solvers that take one, the seed it was run with. Pairs whose input, solver
+source and arguments haven't changed since they were recorded are skipped unless --rerun is given.
+
+This replaces running the getAllOutputsN make targets one after another and picking the winners out
+of the OutputsN directories afterwards.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import anytime
+import results
+import verify
+
+suffixes = [1062, 1063, 1064, 1065, 1066, 1067, 1068, 1069, 1070, 1071, 1072, 1073, 1074, 1075, 1076, 1077, 1078, 1079,
+            1080, 1081, 1082, 1083, 1084, 1085, 1086, 1087, 1088, 1089, 1090, 1091, 1092, 1093, 1094, 1095, 1096, 1097,
+            1098, 1099, 1100, 1101, 1102, 1103, 1128]
+
+# solver12 is left out by default: its random restarts are slow and beaten by solver15
+solvers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 14, 15, 16]
+
+# solvers that only run on some inputs: solver16's exact search is only worth it on the small boards
+# (the same ones as make getAllOutputs16), and on the big ones it would just sit out its time limit
+solver_inputs = {16: [1063, 1065, 1069, 1076]}
+
+# extra command-line arguments per solver (none by default)
+solver_args = {}
+
+# solvers that take --seed: every run gets a fresh one, recorded with the result so it can be replayed
+seeded = {12, 15}
+
+
+def existing_score(suffix, output_file):
+    """Verified score of an output already on disk, or None if it's missing or doesn't pass verify.py."""
+    if not os.path.isfile(output_file):
+        return None
+    is_valid, score, message = verify.verify_solution(f'Inputs/input_group{suffix}.txt', output_file, verbose=False)
+    return score if is_valid else None
+
+
+def job_params(solver):
+    """The parameters a run of this solver is recorded (and looked up) under in the results store."""
+    return {'args': solver_args.get(solver, [])}
+
+
+def run_job(solver, suffix, timeout):
+    """
+    Run one solver on one input.
+    Returns (solver, suffix, output_text, seconds, error_message, seed); output_text is None on failure,
+    and seed is None for solvers that don't take one.
+    """
+    input_file = f'Inputs/input_group{suffix}.txt'
+    command = [sys.executable, f'solver{solver}.py'] + job_params(solver)['args']
+    seed = None
+    if solver in seeded:
+        seed = random.getrandbits(63)
+        command += ['--seed', str(seed)]
+    start = time.time()
+    with open(input_file, 'r') as f:
+        input_text = f.read()
+    # anytime solvers get SIGTERM at the timeout and a few seconds to print their best so far
+    returncode, stdout, stderr, timed_out = anytime.run_with_grace(command, input_text, timeout)
+    seconds = time.time() - start
+    if timed_out and (returncode != 0 or not stdout):
+        return solver, suffix, None, seconds, f"timeout ({timeout:g}s)", seed
+    if returncode != 0:
+        return solver, suffix, None, seconds, f"exited with {returncode}: {stderr.strip()}", seed
+    return solver, suffix, stdout, seconds, None, seed
+
+
+def write_atomic(path, text):
+    """Write text to path so that readers only ever see the old or the new file."""
+    directory = os.path.dirname(path) or '.'
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+        f.write(text)
+    # temporary files are private by default; the output should look like any other
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+def check_output(suffix, output_text):
+    """Verify an output against its input. Returns (is_valid, score, message)."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(output_text)
+    try:
+        return verify.verify_solution(f'Inputs/input_group{suffix}.txt', f.name, verbose=False)
+    finally:
+        os.unlink(f.name)
+
+
+def run_portfolio(solver_list, suffix_list, output_dir, jobs, timeout, fresh=False, store=None, rerun=False):
+    """
+    Run every (solver, input) pair and keep the best output per input. Returns {suffix: (score, solver)}.
+    With a results store, results are recorded there and pairs it has already seen are skipped.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    input_hashes = {suffix: results.file_hash(f'Inputs/input_group{suffix}.txt') for suffix in suffix_list}
+    solver_hashes = {solver: results.source_hash(f'solver{solver}.py') for solver in solver_list}
+
+    best = {}
+    for suffix in suffix_list:
+        output_file = os.path.join(output_dir, f'{suffix}.txt')
+        # an existing output only counts if it verifies, so a corrupt or hand-edited file with a big
+        # claimed score can't block every new result
+        score = None if fresh else existing_score(suffix, output_file)
+        best[suffix] = (score if score is not None else -1, 'existing')
+        # the store may know something better than what's on disk
+        stored = store.best(input_hashes[suffix]) if store is not None else None
+        if stored is not None and stored['score'] > best[suffix][0]:
+            write_atomic(output_file, stored['output'])
+            best[suffix] = (stored['score'], 'stored')
+
+    pairs = [(solver, suffix) for suffix in suffix_list for solver in solver_list
+             if suffix in solver_inputs.get(solver, suffix_list)]
+    if store is not None and not rerun:
+        pairs = [(solver, suffix) for solver, suffix in pairs
+                 if not store.has_run(input_hashes[suffix], f'solver{solver}', solver_hashes[solver],
+                                      job_params(solver))]
+    print(f"Running {len(pairs)} jobs on {jobs} workers")
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_job, solver, suffix, timeout) for solver, suffix in pairs]
+        for done, future in enumerate(as_completed(futures), 1):
+            solver, suffix, output_text, seconds, error, seed = future.result()
+            prefix = f"[{done}/{len(pairs)}] solver{solver} on {suffix} ({seconds:.1f}s):"
+
+            if output_text is None:
+                failures += 1
+                print(f"{prefix} FAILED, {error}")
+                continue
+
+            is_valid, score, message = check_output(suffix, output_text)
+            if not is_valid:
+                failures += 1
+                print(f"{prefix} INVALID, {message}")
+                continue
+
+            if store is not None:
+                store.record(input_hashes[suffix], f'Inputs/input_group{suffix}.txt', f'solver{solver}',
+                             solver_hashes[solver], score, seconds, output_text, job_params(solver), seed)
+
+            if score > best[suffix][0]:
+                best[suffix] = (score, solver)
+                write_atomic(os.path.join(output_dir, f'{suffix}.txt'), output_text)
+                print(f"{prefix} {score} (new best)")
+            else:
+                print(f"{prefix} {score}")
+
+    print()
+    for suffix in suffix_list:
+        score, solver = best[suffix]
+        if score < 0:
+            print(f'No valid solution for suffix: {suffix}')
+            continue
+        source = solver if solver in ('existing', 'stored') else f'solver{solver}'
+        print(f'Best solution for suffix: {suffix} is from {source} with score {score}')
+    if failures:
+        print(f"{failures} jobs failed or gave invalid output")
+    return best
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Race all solvers on every input and keep the best output per input')
+    parser.add_argument('--solvers', type=int, nargs='+', default=solvers, help='Solver numbers to run')
+    parser.add_argument('--inputs', type=int, nargs='+', default=suffixes, help='Input suffixes to run')
+    parser.add_argument('--output-dir', default='bestOutputs', help='Where the best outputs go (default: bestOutputs)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Solvers to run at once (default: number of CPUs)')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Seconds before a job is killed (default: 120)')
+    parser.add_argument('--fresh', action='store_true',
+                        help="Ignore the outputs already in the output directory instead of trying to beat them")
+    parser.add_argument('--db', default=results.DEFAULT_PATH,
+                        help=f'Results store to record runs in (default: {results.DEFAULT_PATH})')
+    parser.add_argument('--no-db', action='store_true', help="Don't use the results store at all")
+    parser.add_argument('--rerun', action='store_true',
+                        help='Run pairs even if the store has a result for the same input and solver source')
+
+    args = parser.parse_args()
+
+    store = None if args.no_db else results.ResultsStore(args.db)
+    run_portfolio(args.solvers, args.inputs, args.output_dir, args.jobs, args.timeout, args.fresh, store, args.rerun)
+    if store is not None:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
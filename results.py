@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Same Game Results Store
+A small SQLite database of every solver run: which input (by content hash), which solver (by name and
+a hash of its source), the parameters and seed it ran with, the score, the runtime and the output
+itself (zlib-compressed). Runners write to it and "what's our best output for this input?" becomes a
+query instead of re-reading the first line of every output file.
+
+Because inputs and solvers are identified by content (a solver's hash covers its own source and every
+local module it imports), a runner can also ask whether a (solver, input) pair has already been run
+with the current versions of both and skip it. The outputs table does the same for output files, so
+a sweep only rewrites the ones that are out of date.
+
+Run as a script to list the best stored result per input, or to write them out with --export.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+DEFAULT_PATH = 'results.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    input_name TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    solver_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    runtime REAL NOT NULL,
+    moves BLOB NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_input ON results (input_hash, score);
+CREATE INDEX IF NOT EXISTS results_run ON results (input_hash, solver, solver_hash, params);
+CREATE TABLE IF NOT EXISTS outputs (
+    path TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    solver_hash TEXT NOT NULL
+);
+'''
+
+
+def file_hash(path):
+    """sha256 of a file's contents."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def local_imports(path):
+    """Modules imported by a Python file that live next to it as .py files."""
+    with open(path, 'r') as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    directory = os.path.dirname(path)
+    return sorted(name for name in names if os.path.isfile(os.path.join(directory, f'{name}.py')))
+
+
+def source_hash(script):
+    """
+    sha256 over a script's source and the source of every local module it imports (transitively), so
+    editing engine.py changes the hash of every solver built on it.
+    """
+    directory = os.path.dirname(script)
+    seen = set()
+    todo = [script]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        todo.extend(os.path.join(directory, f'{name}.py') for name in local_imports(path))
+    digest = hashlib.sha256()
+    for path in sorted(seen):
+        digest.update(os.path.basename(path).encode() + b'\0')
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, input_hash, input_name, solver, solver_hash, score, runtime, output_text,
+               params=None, seed=None):
+        """Store one run. output_text is the solver's output (score, move count, moves)."""
+        with self.db:
+            self.db.execute(
+                'INSERT INTO results (input_hash, input_name, solver, solver_hash, params, seed, score, runtime,'
+                ' moves, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (input_hash, input_name, solver, solver_hash, json.dumps(params or {}, sort_keys=True), seed,
+                 score, runtime, zlib.compress(output_text.encode()), time.time()))
+
+    def has_run(self, input_hash, solver, solver_hash, params=None):
+        """True if this solver version already ran on this input with these parameters."""
+        row = self.db.execute(
+            'SELECT 1 FROM results WHERE input_hash = ? AND solver = ? AND solver_hash = ? AND params = ? LIMIT 1',
+            (input_hash, solver, solver_hash, json.dumps(params or {}, sort_keys=True))).fetchone()
+        return row is not None
+
+    def best(self, input_hash):
+        """The best stored run for an input as a dict (output decompressed), or None."""
+        row = self.db.execute(
+            'SELECT input_name, solver, params, seed, score, runtime, moves FROM results'
+            ' WHERE input_hash = ? ORDER BY score DESC, id LIMIT 1', (input_hash,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'input': row[0],
+            'solver': row[1],
+            'params': json.loads(row[2]),
+            'seed': row[3],
+            'score': row[4],
+            'runtime': row[5],
+            'output': zlib.decompress(row[6]).decode()
+        }
+
+    def output_is_current(self, path, input_hash, solver_hash):
+        """True if path exists and was last written from this input and solver source."""
+        row = self.db.execute('SELECT input_hash, solver_hash FROM outputs WHERE path = ?', (path,)).fetchone()
+        return os.path.isfile(path) and row == (input_hash, solver_hash)
+
+    def mark_output(self, path, input_hash, solver_hash):
+        """Remember which input and solver source path was written from."""
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO outputs (path, input_hash, solver_hash) VALUES (?, ?, ?)',
+                            (path, input_hash, solver_hash))
+
+    def best_scores(self):
+        """{input_hash: (input_name, score, solver)} of the best stored run for every input."""
+        best = {}
+        rows = self.db.execute('SELECT input_hash, input_name, solver, score FROM results ORDER BY score DESC, id')
+        for input_hash, input_name, solver, score in rows:
+            best.setdefault(input_hash, (input_name, score, solver))
+        return best
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show (or export) the best stored result for every input')
+    parser.add_argument('--db', default=DEFAULT_PATH, help=f'Results database (default: {DEFAULT_PATH})')
+    parser.add_argument('--export', default=None, metavar='DIR',
+                        help='Write each input\'s best output to DIR/<suffix>.txt')
+
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    best_scores = sorted(store.best_scores().items(), key=lambda item: item[1][0])
+    for input_hash, (input_name, score, solver) in best_scores:
+        print(f'Best solution for {input_name} is from {solver} with score {score}')
+
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+        for input_hash, (input_name, _, _) in best_scores:
+            suffix = os.path.basename(input_name).replace('input_group', '').replace('.txt', '')
+            with open(os.path.join(args.export, f'{suffix}.txt'), 'w') as f:
+                f.write(store.best(input_hash)['output'])
+        print(f'Exported to: {args.export}')
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1 @@
-make getAllOutputs1
-make getAllOutputs2
-make getAllOutputs3
-make getAllOutputs4
-make getAllOutputs5
-make getAllOutputs6
-make getAllOutputs7
-make getAllOutputs8
\ No newline at end of file
+python portfolio.py
@@ -1,8 +1,15 @@
+import argparse
+import hashlib
+import multiprocessing
+import queue
 import random
+import sys
 import time
-import copy
 
-random.seed(time.time())
+import anytime
+import engine
+import playout
+
 # Same Game solver
 # Goal is not to clear the board but to maximize score
 
@@ -10,127 +17,175 @@ random.seed(time.time())
 # make test
 # in a bash terminal. Note that this will overwrite anything in testOutput.txt in your current directory.
 
-# file input
-'''# open input file
-fileName = input()
-file = open(fileName, "r")
-fileContents = file.readlines()
-# extract rows and columns
-line1 = fileContents[0].split()
-r = int(line1[0])
-c = int(line1[1])
-# initialize gridCopy as zeroes
-gridCopy = [[0 for i in range(c)] for j in range(r)]
-for i in range(r):
-    for j in range(c):
-        # convert input to int (not that this really matters but int comparison is faster I guess)
-        gridCopy[i][j] = int(fileContents[i+1][j])'''
-
-# text input
-sizes = input().split()
-r = int(sizes[0])
-c = int(sizes[1])
-grid = [[0 for i in range(c)] for j in range(r)]
-for i in range(r):
-    currentRow = input()
-    for j in range(c):
-        # convert input to int (not that this really matters but int comparison is faster I guess)
-        grid[i][j] = int(currentRow[j])
-
-# keep track of our best score and each of its moves
-potentialOutput = [0, 0]
-
-# repetitions
-numRandomIters = 100
-
-for z in range(numRandomIters):
-    gridCopy = copy.deepcopy(grid)
-    moves = []
-    score = 0
-    # iterate until we can't find more moves
-    while True:
-        # find a valid click to make
-        # BOZO METHOD!!!
-
-        # iterate random (i, j) selections until we find a valid move
-        cells = [(i, j) for i in range(r) for j in range(c) if gridCopy[i][j] != -1]
-        random.shuffle(cells)
-        for cell in cells:
-            currentBlock = [cell]
-            blocksToCheck = [cell]
-            while blocksToCheck != []:
-                currentCheck = blocksToCheck[0]
-                # if the block one over exists, and isn't already in our list, and matches color, then add to group
-                # and also list to iter over
-                if currentCheck[0] != 0 and (currentCheck[0]-1, currentCheck[1]) not in currentBlock and gridCopy[currentCheck[0]-1][currentCheck[1]] == gridCopy[currentCheck[0]][currentCheck[1]]:
-                    currentBlock.append((currentCheck[0]-1, currentCheck[1]))
-                    blocksToCheck.append((currentCheck[0]-1, currentCheck[1]))
-                if currentCheck[0] != r-1 and (currentCheck[0]+1, currentCheck[1]) not in currentBlock and gridCopy[currentCheck[0]+1][currentCheck[1]] == gridCopy[currentCheck[0]][currentCheck[1]]:
-                    currentBlock.append((currentCheck[0]+1, currentCheck[1]))
-                    blocksToCheck.append((currentCheck[0]+1, currentCheck[1]))
-                if currentCheck[1] != 0 and (currentCheck[0], currentCheck[1]-1) not in currentBlock and gridCopy[currentCheck[0]][currentCheck[1]-1] == gridCopy[currentCheck[0]][currentCheck[1]]:
-                    currentBlock.append((currentCheck[0], currentCheck[1]-1))
-                    blocksToCheck.append((currentCheck[0], currentCheck[1]-1))
-                if currentCheck[1] != c-1 and (currentCheck[0], currentCheck[1]+1) not in currentBlock and gridCopy[currentCheck[0]][currentCheck[1]+1] == gridCopy[currentCheck[0]][currentCheck[1]]:
-                    currentBlock.append((currentCheck[0], currentCheck[1]+1))
-                    blocksToCheck.append((currentCheck[0], currentCheck[1]+1))
-                # remove thing we're currently checking from stack
-                blocksToCheck.pop(0)
-            if len(currentBlock) > 1:
-                break
-
-        # if we didn't find a valid click, we are done and can break out of the while loop
-        if len(currentBlock) < 2:
+# anytime mode: with --output the best solution so far is kept in that file, and the search stops
+# early (printing its best) at --time-limit or on SIGTERM
+
+
+def playout_seed(seed, n):
+    """The seed of playout n in a run seeded with seed (an independent 64-bit stream per playout)."""
+    digest = hashlib.sha256(f'{seed}/{n}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def search(kernel, seed, first, step, iterations, stop, checkpoint=None, prune=False):
+    """
+    Play playouts first, first + step, first + 2 * step, ... (up to iterations, or until stop()),
+    each from its own derived seed. Returns the best as (score, moves, playout number, playout seed).
+    With prune, playouts that can no longer beat the best so far are cut short.
+    """
+    best = (0, [], None, None)
+    n = first
+    while iterations is None or n < iterations:
+        if stop():
             break
-        # what color did we remove (important to store now as we change the gridCopy soon)
-        colRemoved = gridCopy[currentBlock[0][0]][currentBlock[0][1]]
-
-        # each move is defined by 1. the color removed 2. the num of blocks removed 3/4 the row/col of any block removed
-        # locations are indexed frmo bottom left so we convert as well
-        moves.append([colRemoved, len(currentBlock), r - currentBlock[0][0], currentBlock[0][1]+1])
-
-        # GRAVITY (filter down, then left if empty column)
-        for (i, j) in currentBlock:
-            gridCopy[i][j] = -1
-        # save non-removed things in each row and append -1s on top
-        for j in range(c):
-            newCol = [gridCopy[i][j] for i in range(r) if gridCopy[i][j] != -1]
-            for i in range(r):
-                if i < r - len(newCol):
-                    gridCopy[i][j] = -1
-                else:
-                    gridCopy[i][j] = newCol[i - (r - len(newCol))]
-
-        # now if we have an empty column, move everything to the left
-        k = 0
-        # prevent infinite loop
-        LoopIters = 0
-        while k < c and LoopIters < c:
-            if gridCopy[r-1][k] == -1:
-                for j in range(k, c-1):
-                    for i in range(r):
-                        gridCopy[i][j] = gridCopy[i][j+1]
-                # make sure the last column is all -1s (all other removals should ensure that col is -1s automatically)
-                for i in range(r):
-                    gridCopy[i][-1] = -1
-                LoopIters += 1
-            else:
-                k += 1
-        # END GRAVITY SECTION
-
-        # repeat this loop until we can't find a valid click
-
-    # tally score:
-    score = 0
-    for move in moves:
-        score += (move[1] - 1)**2
-
-    if score > potentialOutput[0]:
-        potentialOutput = [score, moves]
-
-# output!!
-# format: score, then total num of moves, then details of each move
-print(potentialOutput[0])
-print(len(potentialOutput[1]))
-for move in potentialOutput[1]:
-    print(f'{move[0]} {move[1]} {move[2]} {move[3]}')
+        n_seed = playout_seed(seed, n)
+        score, moves = kernel.playout(random.Random(n_seed), stop, best[0] if prune else None)
+        if score > best[0]:
+            best = (score, moves, n, n_seed)
+            if checkpoint is not None and checkpoint.due(score):
+                checkpoint.save(score, moves)
+        n += step
+    return best
+
+
+class WorkerReport:
+    """Stands in for a worker's checkpoint: every improvement is sent to the parent, which saves it."""
+
+    def __init__(self, messages, worker):
+        self.messages = messages
+        self.worker = worker
+
+    def due(self, score):
+        return True
+
+    def save(self, score, moves):
+        self.messages.put(('improved', self.worker, (score, moves)))
+
+
+def run_worker(r, c, grid, seed, worker, workers, iterations, budget, prune, messages, stop_event):
+    """
+    One process's share of the restarts: every workers-th playout, starting at playout worker. Stops
+    at its own deadline or once the parent sets stop_event. Improvements and the final
+    (best, playouts, cuts, saved seconds) go to the parent through messages.
+    """
+    kernel = playout.PlayoutKernel(r, c, grid)
+    deadline = anytime.Checkpoint(time_limit=budget).stop_requested
+
+    def stop():
+        return stop_event.is_set() or deadline()
+
+    best = search(kernel, seed, worker, workers, iterations, stop, WorkerReport(messages, worker), prune)
+    messages.put(('done', worker, (best, kernel.playouts, kernel.cuts, kernel.saved_seconds())))
+
+
+def run_workers(r, c, grid, seed, workers, iterations, budget, prune, checkpoint):
+    """
+    Run the workers, saving each improvement they report as it arrives and passing on a stop (SIGTERM
+    or the checkpoint's deadline) through a shared event. Returns every worker's final share.
+    """
+    messages = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=run_worker, args=(r, c, grid, seed, worker, workers, iterations,
+                                                                  budget, prune, messages, stop_event))
+                 for worker in range(workers)]
+    for process in processes:
+        process.start()
+
+    shares = {}
+    while len(shares) < workers:
+        if checkpoint.stop_requested():
+            stop_event.set()
+        try:
+            kind, worker, data = messages.get(timeout=0.1)
+        except queue.Empty:
+            if any(not process.is_alive() and process.exitcode for process in processes):
+                stop_event.set()
+                raise RuntimeError('a solver12 worker exited without reporting its result')
+            continue
+        if kind == 'improved':
+            score, moves = data
+            if checkpoint.due(score):
+                checkpoint.save(score, moves)
+        else:
+            shares[worker] = data
+    for process in processes:
+        process.join()
+    return [shares[worker] for worker in range(workers)]
+
+
+def solve(r, c, grid, budget=None, iterations=100, checkpoint=None, seed=None, workers=1, prune=False):
+    """
+    Best of iterations random playouts, as (score, moves). iterations=None keeps going until the
+    budget runs out.
+    Stops early once budget seconds have passed (or when checkpoint says to stop, if one is given).
+    With several workers, each one's improvements are saved to the checkpoint here as they arrive,
+    and a stop request reaches the workers through a shared event.
+
+    Playout n always uses the seed derived from (seed, n), so a run with a fixed seed and iteration
+    count finds the same solution however many workers share it. Without a seed one is picked from
+    the clock. The winning playout's seed is printed to stderr; --replay replays just that playout.
+
+    With prune, a playout is cut once its score plus engine.color_bound of what's left can't beat its
+    worker's best so far. A cut playout could never have won, so the result is the same either way.
+    """
+    if checkpoint is None:
+        checkpoint = anytime.Checkpoint(time_limit=budget)
+    if seed is None:
+        seed = time.time_ns()
+    start = time.perf_counter()
+
+    if workers == 1:
+        kernel = playout.PlayoutKernel(r, c, grid)
+        best = search(kernel, seed, 0, 1, iterations, checkpoint.stop_requested, checkpoint, prune)
+        playouts, cuts, saved = kernel.playouts, kernel.cuts, kernel.saved_seconds()
+    else:
+        # the best of each worker is reduced here (ties go to the earliest playout)
+        shares = run_workers(r, c, grid, seed, workers, iterations, budget, prune, checkpoint)
+        best = max((share[0] for share in shares), key=lambda b: (b[0], -(b[2] if b[2] is not None else 0)))
+        playouts = sum(share[1] for share in shares)
+        cuts = sum(share[2] for share in shares)
+        saved = sum(share[3] for share in shares)
+
+    score, moves, n, n_seed = best
+    seconds = time.perf_counter() - start
+    print(f"{playouts} playouts on {workers} worker(s), {playouts / seconds:.1f} playouts/sec", file=sys.stderr)
+    if prune:
+        print(f"pruning cut {cuts} of {playouts} playouts, about {saved:.2f}s saved", file=sys.stderr)
+    print(f"run seed {seed}: best {score} from playout {n}, playout seed {n_seed}", file=sys.stderr)
+    checkpoint.save(score, moves)
+    return score, moves
+
+
+def replay(r, c, grid, n_seed):
+    """The single playout with this playout seed, as (score, moves)."""
+    return playout.PlayoutKernel(r, c, grid).playout(random.Random(n_seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Same Game random restart solver (reads the board from stdin)')
+    parser.add_argument('--iterations', type=int, default=None,
+                        help='Random playouts to try (default: 100, or as many as fit in --time-limit)')
+    parser.add_argument('--time-limit', type=float, default=None, help='Stop after this many seconds')
+    parser.add_argument('--output', default=None, help='Keep the best solution so far in this file')
+    parser.add_argument('--seed', type=int, default=None, help='Run seed (default: from the clock)')
+    parser.add_argument('--workers', type=int, default=1, help='Processes to split the playouts across (default: 1)')
+    parser.add_argument('--prune', action='store_true',
+                        help='Cut playouts short once they can no longer beat the best so far')
+    parser.add_argument('--replay', type=int, default=None, metavar='PLAYOUT_SEED',
+                        help='Replay the single playout with this playout seed (as printed by an earlier run)')
+    args = parser.parse_args()
+    checkpoint = anytime.Checkpoint(args.output, args.time_limit, catch_sigterm=True)
+
+    iterations = args.iterations
+    if iterations is None and args.time_limit is None:
+        iterations = 100
+
+    if args.replay is not None:
+        score, moves = replay(*engine.read_grid(), args.replay)
+    else:
+        score, moves = solve(*engine.read_grid(), args.time_limit, iterations, checkpoint, args.seed, args.workers,
+                             args.prune)
+
+    # output!!
+    # format: score, then total num of moves, then details of each move
+    engine.print_solution(moves, score)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Same Game Beam Search Solver
+Keeps the best beam-width board states at each depth instead of following a single greedy path.
+States are ranked by accumulated score plus the score of every group that is clickable right now, and
+boards reached by different click orders are only kept once. When the time limit runs out, the best
+state in the beam is finished off greedily (largest group first).
+
+Boards are recognized by their Zobrist hash (see zobrist.py). A transposition table remembers the best
+score each board has been reached with, so a board that was already reached (at this depth or an
+earlier one) with at least the same score isn't kept again.
+
+With --output the best solution so far is also kept in that file (see anytime.py), and SIGTERM ends
+the search early the same way the time limit does.
+"""
+
+import sys
+import time
+
+import anytime
+import components
+import engine
+import zobrist
+
+
+class BeamSearchSolver:
+    def __init__(self, board, beam_width=8, time_limit=20.0, table_size=1 << 16, checkpoint=None):
+        self.board = board
+        self.checkpoint = checkpoint or anytime.Checkpoint()
+        self.beam_width = beam_width
+        self.time_limit = time_limit
+        # board hash -> best score it has been reached with
+        self.table = zobrist.TranspositionTable(table_size)
+        self.score = 0
+        self.moves = []
+        # best move history as a (move, parent) linked list, unwound into self.moves at the end
+        self.history = None
+        self.depth = 0
+        self.expanded = 0
+
+    def evaluate(self, state):
+        """Accumulated score plus everything clickable right now."""
+        score, _, index = state
+        return score + index.potential
+
+    def record(self, score, history):
+        """Keep the state's move history if it beats the best so far."""
+        if score > self.score:
+            self.score = score
+            self.history = history
+
+    def finish_greedy(self, state):
+        """Play out a state by always clicking the largest group."""
+        score, history, index = state
+        while True:
+            move = index.largest()
+            if move is None:
+                break
+            score += move['score']
+            history = (index.apply_move(move), history)
+        self.record(score, history)
+
+    def solve(self):
+        deadline = time.time() + self.time_limit
+        width = self.beam_width
+        # a state is (score, move history as a (move, parent) linked list, component index)
+        beam = [(0, None, components.ComponentIndex(zobrist.attach(self.board.copy())))]
+        table = self.table
+        checkpoint = self.checkpoint
+
+        while time.time() < deadline and not checkpoint.stop_requested():
+            # rank every (state, move) pair by the score right after the move, then only copy the
+            # boards of the best few
+            candidates = []
+            for state in beam:
+                score = state[0]
+                for move in state[2].moves():
+                    candidates.append((score + move['score'], state, move))
+            if not candidates:
+                break
+            candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+            # walk down the ranked candidates until 2 * width new boards are kept, so repeats near
+            # the top don't crowd out the unseen ones further down
+            children = []
+            for score, (_, history, index), move in candidates:
+                if len(children) == 2 * width:
+                    break
+                child = index.copy()
+                record = child.apply_move(move)
+                self.expanded += 1
+                # candidates come best score first, so this also drops repeats within a depth
+                key = child.board.hash
+                known = table.lookup(key)
+                if known is not None and known[0] >= score:
+                    continue
+                table.store(key, score, self.depth)
+                children.append((score, (record, history), child))
+                self.record(score, (record, history))
+
+            if not children:
+                # every candidate repeats a board already reached with at least the same score, so
+                # the beam can't go any deeper: finish its most promising state greedily instead
+                self.finish_greedy(max(beam, key=self.evaluate))
+                break
+            children.sort(key=self.evaluate, reverse=True)
+            beam = children[:width]
+            self.depth += 1
+            if checkpoint.due(self.score):
+                checkpoint.save(self.score, unwind(self.history))
+        else:
+            # out of time: finish the most promising state greedily
+            self.finish_greedy(max(beam, key=self.evaluate))
+
+        self.moves = unwind(self.history)
+        checkpoint.save(self.score, self.moves)
+        return self.score
+
+    def output_solution(self):
+        engine.print_solution(self.moves, self.score)
+
+
+def unwind(history):
+    """Turn a (move, parent) linked list back into a move list, first move first."""
+    moves = []
+    while history is not None:
+        move, history = history
+        moves.append(move)
+    moves.reverse()
+    return moves
+
+
+def solve(r, c, grid, budget=None):
+    """Beam search within budget seconds (20 if not given). Returns (score, moves)."""
+    solver = BeamSearchSolver(engine.Board.from_grid(r, c, grid), time_limit=20.0 if budget is None else budget)
+    solver.solve()
+    return solver.score, solver.moves
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Same Game beam search solver (reads the board from stdin)')
+    parser.add_argument('--beam-width', type=int, default=8, help='States kept per depth (default: 8)')
+    parser.add_argument('--time-limit', type=float, default=20.0,
+                        help='Seconds to search before finishing greedily (default: 20)')
+    parser.add_argument('--table-size', type=int, default=1 << 16,
+                        help='Transposition table entries (default: 65536)')
+    parser.add_argument('--output', default=None, help='Keep the best solution so far in this file')
+
+    args = parser.parse_args()
+
+    board = engine.read_board()
+    checkpoint = anytime.Checkpoint(args.output, catch_sigterm=True)
+    solver = BeamSearchSolver(board, args.beam_width, args.time_limit, args.table_size, checkpoint)
+    solver.solve()
+    solver.output_solution()
+    print(f"depth {solver.depth}, expanded {solver.expanded} states", file=sys.stderr)
+    print(solver.table.stats(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
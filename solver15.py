@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Same Game Nested Monte Carlo Search Solver
+Level 0 is a single random playout (what solver12 repeats). At level n, every legal move is tried by
+running a level n-1 search after it, the best sequence seen so far is memorized, and its next move is
+played. Playouts avoid the most common color ("tabu color") while any other move exists, which lets
+that color build up into one big group.
+
+Sequences are stored as the first square of each group clicked, which is enough to replay them on the
+board they were found on. Once the time limit passes, playouts stop where they are (any prefix of moves
+is a valid answer) and every level just follows its best sequence, so the search finishes right
+after the deadline. SIGTERM is treated the same way, and with --output the best solution so far is
+also kept in that file (see anytime.py).
+"""
+
+import random
+import sys
+import time
+
+import anytime
+import components
+import engine
+
+
+class NestedMonteCarloSearch:
+    def __init__(self, board, level=1, time_limit=20.0, seed=None, checkpoint=None):
+        self.board = board
+        self.checkpoint = checkpoint or anytime.Checkpoint()
+        self.level = level
+        self.time_limit = time_limit
+        self.rng = random.Random(seed)
+        self.deadline = None
+        self.score = 0
+        self.moves = []
+        self.playouts = 0
+
+    def out_of_time(self):
+        return time.time() >= self.deadline or self.checkpoint.terminated
+
+    def replay(self, sequence):
+        """Output records for a sequence of first squares played from the starting board."""
+        index = components.ComponentIndex(self.board.copy())
+        return [index.apply_move(index.groups[index.labels[pos]]) for pos in sequence]
+
+    def playout(self, index, score):
+        """Tabu-color random playout from index (which is consumed). Returns (score, sequence)."""
+        rng = self.rng
+        counts = {}
+        for color in index.board.cells:
+            counts[color] = counts.get(color, 0) + 1
+        counts.pop(engine.EMPTY, None)
+        tabu = max(counts, key=counts.get) if counts else None
+
+        sequence = []
+        while not self.out_of_time():
+            moves = index.moves()
+            if not moves:
+                break
+            allowed = [move for move in moves if move['color'] != tabu]
+            move = rng.choice(allowed or moves)
+            score += move['score']
+            sequence.append(move['pos'])
+            index.remove(move['component'])
+        self.playouts += 1
+        return score, sequence
+
+    def nested(self, index, score, level):
+        """Level-n search from index (which is consumed). Returns (score, sequence) of the best line found."""
+        if level == 0:
+            return self.playout(index, score)
+
+        best_score = -1
+        best_sequence = []
+        played = []
+        while True:
+            moves = index.moves()
+            if not moves:
+                break
+            if not self.out_of_time():
+                for move in moves:
+                    child = index.copy()
+                    child.remove(move['component'])
+                    child_score, sequence = self.nested(child, score + move['score'], level - 1)
+                    if child_score > best_score:
+                        best_score = child_score
+                        best_sequence = [move['pos']] + sequence
+                        if level == self.level and self.checkpoint.due(best_score):
+                            self.checkpoint.save(best_score, self.replay(played + best_sequence))
+                    if self.out_of_time():
+                        break
+
+            if not best_sequence:
+                # ran out of time before finding anything from here
+                break
+
+            # play the next move of the best sequence found so far
+            pos = best_sequence.pop(0)
+            move = index.groups[index.labels[pos]]
+            score += move['score']
+            played.append(pos)
+            index.remove(move['component'])
+
+        return score, played
+
+    def solve(self):
+        self.deadline = time.time() + self.time_limit
+        root = components.ComponentIndex(self.board.copy())
+        self.score, sequence = self.nested(root, 0, self.level)
+
+        # replay the winning sequence to get the output records
+        self.moves = self.replay(sequence)
+        self.checkpoint.save(self.score, self.moves)
+        return self.score
+
+    def output_solution(self):
+        engine.print_solution(self.moves, self.score)
+
+
+def solve(r, c, grid, budget=None):
+    """Level 1 nested Monte Carlo search within budget seconds (20 if not given). Returns (score, moves)."""
+    solver = NestedMonteCarloSearch(engine.Board.from_grid(r, c, grid), time_limit=20.0 if budget is None else budget)
+    solver.solve()
+    return solver.score, solver.moves
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Same Game nested Monte Carlo search solver (reads the board from stdin)')
+    parser.add_argument('--level', type=int, default=1, help='Nesting level (default: 1)')
+    parser.add_argument('--time-limit', type=float, default=20.0,
+                        help='Seconds to search before following the best sequence found (default: 20)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed (default: time based)')
+    parser.add_argument('--output', default=None, help='Keep the best solution so far in this file')
+
+    args = parser.parse_args()
+
+    board = engine.read_board()
+    checkpoint = anytime.Checkpoint(args.output, catch_sigterm=True)
+    solver = NestedMonteCarloSearch(board, args.level, args.time_limit, args.seed, checkpoint)
+    solver.solve()
+    solver.output_solution()
+    print(f"{solver.playouts} playouts", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
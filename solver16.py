@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Same Game Branch and Bound Solver
+Exact depth-first search for small boards (like the 7x7, 12x16, 16x12 and 18x12 inputs). Moves are
+tried biggest group first, so the first line searched is the greedy one and there is always an
+answer to fall back on.
+
+Plain depth-first search spends its whole time limit rearranging the last few moves of that first
+line, so the search runs in passes (limited discrepancy search): taking the i-th best move at some
+point costs i, and each pass raises the total allowed. The last pass is the one where no move was
+skipped for lack of budget, which makes it a complete search. A branch is cut when:
+- its score plus engine.color_bound (every color collapsing into one group) can't beat the best
+  complete line found so far, or
+- the same board (by Zobrist hash, see zobrist.py) was already searched after reaching it with at
+  least the same score and discrepancy budget. Everything below it was covered then, and the best
+  line only gets better, so nothing cut then would survive now.
+
+If the search runs to the end, the answer is a proven optimum; otherwise it's the best line found
+within the time limit. Either way the node count, nodes/sec and whether optimality was proven go to
+stderr. With --output the best solution so far is also kept in that file (see anytime.py).
+"""
+
+import sys
+import time
+
+import anytime
+import engine
+import zobrist
+
+
+class BranchAndBoundSolver:
+    def __init__(self, board, time_limit=20.0, table_size=1 << 20, checkpoint=None):
+        self.board = board
+        self.checkpoint = checkpoint or anytime.Checkpoint()
+        self.time_limit = time_limit
+        # board hash -> best score it has been reached with
+        self.table = zobrist.TranspositionTable(table_size)
+        self.score = -1
+        self.moves = []
+        self.proven = False
+        # set when a pass skipped a move for lack of discrepancy budget
+        self.limited = False
+        self.passes = 0
+        self.nodes = 0
+        self.seconds = 0.0
+
+    def enter(self, board, score, counts, budget, path, stack):
+        """Push board's search frame, unless it's finished (updating the best line) or cut."""
+        self.nodes += 1
+        table = self.table
+        key = board.hash
+        known = table.lookup(key)
+        if known is not None and known[0] >= score and known[1] >= budget:
+            return
+        table.store(key, score, budget)
+
+        bound = engine.color_bound(counts)
+        if score + bound <= self.score:
+            return
+        moves = board.find_all_moves()
+        if not moves:
+            if score > self.score:
+                self.score = score
+                self.moves = path[:]
+                if self.checkpoint.due(score):
+                    self.checkpoint.save(score, self.moves)
+            return
+        # biggest group first (ties keep row-major order)
+        moves.sort(key=lambda move: -move['size'])
+        stack.append([board, score, counts, bound, budget, moves, 0])
+
+    def search(self, root, budget, deadline):
+        """
+        One depth-first pass where taking the i-th best move costs i of the discrepancy budget.
+        Returns False if it ran out of time.
+        """
+        checkpoint = self.checkpoint
+        # a frame is [board, score, color counts, bound, discrepancies left, moves, next move]
+        stack = []
+        path = []
+        self.enter(root, 0, engine.color_counts(root.cells), budget, path, stack)
+
+        while stack:
+            # never stop before the first (greedy) line is complete, so there's always an answer
+            if self.score >= 0 and self.nodes % 256 == 0:
+                if time.time() >= deadline or checkpoint.stop_requested():
+                    return False
+            frame = stack[-1]
+            board, score, counts, bound, left, moves, i = frame
+            # the best line may have improved since this frame was pushed
+            if i == len(moves) or i > left or score + bound <= self.score:
+                if i < len(moves) and i > left and score + bound > self.score:
+                    self.limited = True
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            frame[6] = i + 1
+            move = moves[i]
+            child = board.copy()
+            path.append(child.apply_move(move))
+            child_counts = dict(counts)
+            child_counts[move['color']] -= move['size']
+            depth = len(stack)
+            self.enter(child, score + move['score'], child_counts, left - i, path, stack)
+            if len(stack) == depth:
+                path.pop()
+        return True
+
+    def solve(self):
+        start = time.time()
+        deadline = start + self.time_limit
+        root = zobrist.attach(self.board.copy())
+
+        # limited discrepancy search: budget 0 is the greedy line, and each pass allows more
+        # deviations from the move ordering until one finishes without hitting the budget anywhere
+        budget = 0
+        while True:
+            self.limited = False
+            if not self.search(root, budget, deadline):
+                break
+            if not self.limited:
+                self.proven = True
+                break
+            budget += 1
+        self.passes = budget + 1
+
+        self.seconds = time.time() - start
+        self.checkpoint.save(self.score, self.moves)
+        return self.score
+
+    def output_solution(self):
+        engine.print_solution(self.moves, self.score)
+
+    def stats(self):
+        rate = self.nodes / self.seconds if self.seconds else 0
+        result = 'optimum proven' if self.proven else 'best found, not proven optimal'
+        return f"{self.nodes} nodes in {self.seconds:.2f}s ({rate:.0f} nodes/sec), {self.passes} passes, {result}"
+
+
+def solve(r, c, grid, budget=None):
+    """Branch and bound within budget seconds (20 if not given). Returns (score, moves)."""
+    solver = BranchAndBoundSolver(engine.Board.from_grid(r, c, grid), time_limit=20.0 if budget is None else budget)
+    solver.solve()
+    return solver.score, solver.moves
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Same Game exact branch and bound solver (reads the board from stdin)')
+    parser.add_argument('--time-limit', type=float, default=20.0,
+                        help='Seconds to search before giving up on a proof (default: 20)')
+    parser.add_argument('--table-size', type=int, default=1 << 20,
+                        help='Transposition table entries (default: 1048576)')
+    parser.add_argument('--output', default=None, help='Keep the best solution so far in this file')
+
+    args = parser.parse_args()
+
+    board = engine.read_board()
+    checkpoint = anytime.Checkpoint(args.output, catch_sigterm=True)
+    solver = BranchAndBoundSolver(board, args.time_limit, args.table_size, checkpoint)
+    solver.solve()
+    solver.output_solution()
+    print(solver.stats(), file=sys.stderr)
+    print(solver.table.stats(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Solver Benchmark
+Runs each solver's solve() on every input, grouped by size class (the grid dimensions, eg. 7x7,
+25x25, 100x100, 20x500, 5000x2), and reports wall time, moves per second, peak memory and score.
+
+Every (solver, input) pair runs in a fresh Python process, so peak memory (the process's max RSS) and
+imports don't leak from one run into the next; wall time only covers the solve() call. A run that
+takes longer than --timeout is stopped (see anytime.run_with_grace) and reported as failed, so one
+slow solver on a big board can't hold up the whole suite. Results can
+be saved as a baseline, and later runs are compared against it: a run is flagged as a regression when
+it is slower, uses more memory or scores lower than the baseline by more than --threshold (solver12 is
+random, so small score changes are expected). Timings depend on the machine, so baselines aren't
+committed.
+"""
+
+import csv
+import glob
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anytime
+import verify
+
+solvers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
+
+DEFAULT_BASELINE = 'benchmarkBaseline.json'
+
+# timings this small are mostly noise, so they're never flagged
+MIN_FLAGGED_SECONDS = 0.05
+
+# what a job runs: measure() in a fresh interpreter, printing its result as JSON
+MEASURE = ('import json, sys, solverBenchmark; '
+           'budget = None if sys.argv[3] == "none" else float(sys.argv[3]); '
+           'print(json.dumps(solverBenchmark.measure(int(sys.argv[1]), sys.argv[2], budget)))')
+
+
+def measure(solver, input_file, budget):
+    """Worker: solve one input with one solver and report what it cost."""
+    import importlib
+
+    module = importlib.import_module(f'solver{solver}')
+    r, c, grid = verify.read_input(input_file)
+    start = time.perf_counter()
+    score, moves = module.solve(r, c, grid, budget)
+    seconds = time.perf_counter() - start
+    return {
+        'solver': solver,
+        'input': os.path.basename(input_file),
+        'size': f'{r}x{c}',
+        'seconds': seconds,
+        'moves': len(moves),
+        'score': score,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'error': None
+    }
+
+
+def run_job(solver, input_file, budget, timeout):
+    """
+    Measure one pair in its own process, stopping it after timeout seconds. A run that fails or times
+    out is returned with its error, no score and no moves.
+    """
+    command = [sys.executable, '-c', MEASURE, str(solver), input_file, 'none' if budget is None else str(budget)]
+    start = time.perf_counter()
+    returncode, stdout, stderr, timed_out = anytime.run_with_grace(command, '', timeout)
+    if returncode == 0 and not timed_out:
+        return json.loads(stdout.splitlines()[-1])
+    r, c, _ = verify.read_input(input_file)
+    if timed_out:
+        error = f"timeout ({timeout:g}s)"
+    else:
+        lines = stderr.strip().splitlines()
+        error = f"exited with {returncode}: {lines[-1] if lines else ''}"
+    return {
+        'solver': solver,
+        'input': os.path.basename(input_file),
+        'size': f'{r}x{c}',
+        'seconds': time.perf_counter() - start,
+        'moves': 0,
+        'score': 0,
+        'peak_kb': 0,
+        'error': error
+    }
+
+
+def run_benchmark(solver_list, input_files, budget, jobs, timeout):
+    """Measure every (solver, input) pair. Returns the results in (solver, input) order."""
+    pairs = [(solver, input_file) for solver in solver_list for input_file in input_files]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_job, solver, input_file, budget, timeout) for solver, input_file in pairs]
+        runs = []
+        for (solver, input_file), future in zip(pairs, futures):
+            run = future.result()
+            outcome = (f"FAILED, {run['error']}" if run['error']
+                       else f"{run['score']} in {run['seconds']:.2f}s")
+            print(f"solver{solver} {run['input']} ({run['size']}): {outcome}", file=sys.stderr)
+            runs.append(run)
+    return runs
+
+
+def run_key(run):
+    return f"solver{run['solver']}/{run['input']}"
+
+
+def find_regressions(runs, baseline, threshold):
+    """{run key: [reasons]} for every run that got worse than its baseline."""
+    regressions = {}
+    for run in runs:
+        base = baseline.get(run_key(run))
+        if base is None:
+            continue
+        if run['error']:
+            regressions[run_key(run)] = [f"failed: {run['error']}"]
+            continue
+        reasons = []
+        if run['seconds'] > base['seconds'] * (1 + threshold) and run['seconds'] > MIN_FLAGGED_SECONDS:
+            reasons.append(f"time {base['seconds']:.2f}s -> {run['seconds']:.2f}s")
+        if run['peak_kb'] > base['peak_kb'] * (1 + threshold):
+            reasons.append(f"memory {base['peak_kb'] / 1024:.0f}MB -> {run['peak_kb'] / 1024:.0f}MB")
+        if run['score'] < base['score'] * (1 - threshold):
+            reasons.append(f"score {base['score']} -> {run['score']}")
+        if reasons:
+            regressions[run_key(run)] = reasons
+    return regressions
+
+
+def size_order(size):
+    r, c = map(int, size.split('x'))
+    return r * c, r
+
+
+def print_tables(runs, solver_list, regressions):
+    sizes = sorted({run['size'] for run in runs}, key=size_order)
+    by_pair = {}
+    for run in runs:
+        by_pair.setdefault((run['solver'], run['size']), []).append(run)
+
+    # totals only cover the runs that finished; failed ones are counted separately
+    print(f"{'Solver':<10} {'Time s':>9} {'Moves/s':>10} {'Peak MB':>8} {'Score':>10} {'Failed':>7}"
+          f" {'Regressions':>12}")
+    print("-" * 72)
+    for solver in solver_list:
+        solver_runs = [run for run in runs if run['solver'] == solver and not run['error']]
+        failed = sum(1 for run in runs if run['solver'] == solver and run['error'])
+        seconds = sum(run['seconds'] for run in solver_runs)
+        moves = sum(run['moves'] for run in solver_runs)
+        peak = max((run['peak_kb'] for run in solver_runs), default=0) / 1024
+        score = sum(run['score'] for run in solver_runs)
+        flagged = sum(1 for run in runs if run['solver'] == solver and run_key(run) in regressions)
+        rate = moves / seconds if seconds else 0
+        print(f"{'solver' + str(solver):<10} {seconds:>9.2f} {rate:>10.0f} {peak:>8.0f} {score:>10} {failed:>7}"
+              f" {flagged:>12}")
+
+    for title, value, fmt in (('Score', lambda rs: sum(r['score'] for r in rs), '{:>10}'),
+                              ('Time s', lambda rs: sum(r['seconds'] for r in rs), '{:>10.2f}')):
+        print(f"\n{title} by size class")
+        print(f"{'Size':<10}" + ''.join(f"{'solver' + str(solver):>10}" for solver in solver_list))
+        print("-" * (10 + 10 * len(solver_list)))
+        for size in sizes:
+            cells = [f"{'failed':>10}" if any(run['error'] for run in by_pair[(solver, size)])
+                     else fmt.format(value(by_pair[(solver, size)])) for solver in solver_list]
+            print(f"{size:<10}" + ''.join(cells))
+
+    if regressions:
+        print("\nRegressions against the baseline")
+        for key, reasons in sorted(regressions.items()):
+            print(f"  {key}: {', '.join(reasons)}")
+
+
+def write_csv(path, runs):
+    fields = ['solver', 'input', 'size', 'cells', 'seconds', 'moves', 'score', 'peak_kb', 'error']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for run in runs:
+            r, c = map(int, run['size'].split('x'))
+            writer.writerow(dict(run, cells=r * c))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark solvers by size class against a stored baseline')
+    parser.add_argument('input_dir', nargs='?', default='Inputs', help='Directory containing input files')
+    parser.add_argument('--solvers', type=int, nargs='+', default=solvers, help='Solver numbers to benchmark')
+    parser.add_argument('--sizes', nargs='+', default=None, help='Only these size classes (eg. 25x25 5000x2)')
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='Seconds passed to solve() for solvers that search (default: 10)')
+    parser.add_argument('--timeout', type=float, default=120.0,
+                        help='Seconds before a run is stopped and counted as failed (default: 120)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Runs at once (default: 1; more is faster but makes timings noisier)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help=f'Baseline file (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--csv', default=None, help='Also write every run to this CSV (eg. to chart time against cells)')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown, memory growth or score loss before flagging (default: 0.2 = 20%%)')
+
+    args = parser.parse_args()
+
+    input_files = sorted(glob.glob(os.path.join(args.input_dir, "*.txt")))
+    if args.sizes:
+        def size_of(input_file):
+            with open(input_file, 'r') as f:
+                return 'x'.join(f.readline().split())
+        input_files = [input_file for input_file in input_files if size_of(input_file) in args.sizes]
+    if not input_files:
+        print(f"No matching .txt files found in {args.input_dir}")
+        sys.exit(1)
+
+    runs = run_benchmark(args.solvers, input_files, args.budget, args.jobs, args.timeout)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    regressions = find_regressions(runs, baseline, args.threshold)
+
+    print_tables(runs, args.solvers, regressions)
+
+    if args.csv:
+        write_csv(args.csv, runs)
+
+    if args.save_baseline:
+        # a failed run has nothing to compare against, so it never replaces a baseline entry
+        baseline.update({run_key(run): run for run in runs if not run['error']})
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline saved to: {args.baseline}")
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
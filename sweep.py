@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Same Game Incremental Sweep
+Regenerates the per-solver output directories (what the getAllOutputsN make targets do), but only
+for (solver, input) pairs that are out of date: like make's dependency tracking, except staleness is
+decided by content. A pair is rerun when its output file is missing or failed verification, or when
+the input file or the solver's source (including the local modules it imports, see
+results.source_hash) has changed since the output was written. Valid results are also recorded in
+the results store.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import portfolio
+import results
+
+suffixes = portfolio.suffixes
+
+solvers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]
+
+
+def output_file(solver, suffix):
+    """Where the make targets put this solver's output for an input."""
+    if solver == 13:
+        return f'outputs13/input_group{suffix}_output.txt'
+    return f'Outputs{solver}/{suffix}.txt'
+
+
+def stale_pairs(store, solver_list, suffix_list):
+    """
+    The (solver, suffix) pairs whose outputs are out of date.
+    Also returns the input and solver hashes they were judged by.
+    """
+    input_hashes = {suffix: results.file_hash(f'Inputs/input_group{suffix}.txt') for suffix in suffix_list}
+    solver_hashes = {solver: results.source_hash(f'solver{solver}.py') for solver in solver_list}
+    stale = [(solver, suffix) for solver in solver_list for suffix in suffix_list
+             if suffix in portfolio.solver_inputs.get(solver, suffix_list)
+             and not store.output_is_current(output_file(solver, suffix), input_hashes[suffix], solver_hashes[solver])]
+    return stale, input_hashes, solver_hashes
+
+
+def run_sweep(store, solver_list, suffix_list, jobs, timeout, dry_run=False):
+    """Rerun every stale pair. Returns (pairs run, pairs that failed or gave invalid output)."""
+    stale, input_hashes, solver_hashes = stale_pairs(store, solver_list, suffix_list)
+    total = sum(1 for solver in solver_list for suffix in suffix_list
+                if suffix in portfolio.solver_inputs.get(solver, suffix_list))
+    print(f"{len(stale)} of {total} outputs are out of date")
+    if dry_run:
+        for solver, suffix in stale:
+            print(f"  {output_file(solver, suffix)}")
+        return len(stale), 0
+
+    failures = 0
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(portfolio.run_job, solver, suffix, timeout) for solver, suffix in stale]
+        for done, future in enumerate(as_completed(futures), 1):
+            solver, suffix, output_text, seconds, error, seed = future.result()
+            path = output_file(solver, suffix)
+            prefix = f"[{done}/{len(stale)}] {path} ({seconds:.1f}s):"
+            if output_text is None:
+                failures += 1
+                print(f"{prefix} FAILED, {error}")
+                continue
+
+            is_valid, score, message = portfolio.check_output(suffix, output_text)
+            if is_valid:
+                # an invalid output is neither written over the previous one nor marked current, so
+                # it's rerun next sweep
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                portfolio.write_atomic(path, output_text)
+                store.mark_output(path, input_hashes[suffix], solver_hashes[solver])
+                store.record(input_hashes[suffix], f'Inputs/input_group{suffix}.txt', f'solver{solver}',
+                             solver_hashes[solver], score, seconds, output_text, portfolio.job_params(solver), seed)
+                print(f"{prefix} {score}")
+            else:
+                failures += 1
+                print(f"{prefix} INVALID, {message}")
+
+    print(f"\nReran {len(stale)} of {total} pairs in {time.time() - start:.1f}s, {failures} failed")
+    return len(stale), failures
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rerun only the (solver, input) pairs whose outputs are out of date')
+    parser.add_argument('--solvers', type=int, nargs='+', default=solvers, help='Solver numbers to sweep')
+    parser.add_argument('--inputs', type=int, nargs='+', default=suffixes, help='Input suffixes to sweep')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Solvers to run at once (default: number of CPUs)')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Seconds before a job is killed (default: 120)')
+    parser.add_argument('--db', default=results.DEFAULT_PATH, help=f'Results store (default: {results.DEFAULT_PATH})')
+    parser.add_argument('--dry-run', action='store_true', help='Only list the outputs that are out of date')
+
+    args = parser.parse_args()
+
+    store = results.ResultsStore(args.db)
+    run_sweep(store, args.solvers, args.inputs, args.jobs, args.timeout, args.dry_run)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,38 @@
 """
 Test Runner for Same Game Solver
 Runs the solver on multiple input files and optionally verifies outputs.
+
+By default every input runs the solver script in its own python3 process (which keeps untrusted
+solvers sandboxed). With --mode inprocess the solver's solve(r, c, grid, budget) function is called in
+a pool of worker processes instead, so interpreter startup and imports are paid once per worker, and
+scores and verification results come back as data rather than parsed text.
+
+--jobs runs that many inputs at once in either mode, and results are still printed in input order.
+Each input gets a timeout of --timeout seconds plus --timeout-per-kcell seconds per 1000 squares, in
+either mode; an in-process solve() that runs over is stopped by replacing the worker pool.
+In subprocess mode a solver that reaches its timeout gets SIGTERM and a short grace period, so the
+anytime solvers (see anytime.py) still hand in their best solution so far.
 """
 
 import os
 import sys
 import subprocess
 import glob
+import importlib
+import io
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_solver_on_file(solver_script, input_file, output_file):
+import anytime
+
+def input_timeout(input_file, base=30.0, per_kcell=3.0):
+    """Timeout for one input: base seconds plus per_kcell seconds for every 1000 squares of the grid."""
+    with open(input_file, 'r') as f:
+        r, c = map(int, f.readline().split())
+    return base + per_kcell * r * c / 1000
+
+def run_solver_on_file(solver_script, input_file, output_file, timeout=30.0):
     """
     Run the solver on a single input file and save output.
     Returns (success, score, error_message)
@@ -19,32 +42,27 @@ def run_solver_on_file(solver_script, input_file, output_file):
         with open(input_file, 'r') as f:
             input_data = f.read()
         
-        # Run the solver
-        result = subprocess.run(
-            ['python3', solver_script],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            timeout=30  # 30 second timeout
-        )
+        # Run the solver (at the timeout it gets SIGTERM first, so an anytime solver can still print
+        # its best so far)
+        returncode, stdout, stderr, timed_out = anytime.run_with_grace(['python3', solver_script], input_data, timeout)
         
-        if result.returncode != 0:
-            return False, 0, f"Solver error: {result.stderr}"
+        if timed_out and (returncode != 0 or not stdout.strip()):
+            return False, 0, f"Solver timeout ({timeout:g}s)"
+        if returncode != 0:
+            return False, 0, f"Solver error: {stderr}"
         
         # Save output
         with open(output_file, 'w') as f:
-            f.write(result.stdout)
+            f.write(stdout)
         
         # Extract score from first line
-        lines = result.stdout.strip().split('\n')
+        lines = stdout.strip().split('\n')
         if lines:
             score = int(lines[0])
             return True, score, None
         else:
             return False, 0, "No output from solver"
     
-    except subprocess.TimeoutExpired:
-        return False, 0, "Solver timeout (30s)"
     except Exception as e:
         return False, 0, f"Error: {str(e)}"
 
@@ -81,7 +99,49 @@ def verify_solution(verifier_script, input_file, output_file):
     except Exception as e:
         return False, 0, f"Verifier error: {str(e)}"
 
-def run_all_tests(input_dir, output_dir, solver_script, verifier_script=None):
+def solve_in_process(solver_script, input_file, budget, check):
+    """
+    Worker side of the in-process mode: import the solver module and call its solve().
+    Returns (success, score, error_message, output_text, verification) where verification is
+    (is_valid, verified_score, error_message), or None when check is off or the solver failed.
+    """
+    import engine
+    import verify
+
+    try:
+        directory, name = os.path.split(os.path.abspath(solver_script))
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        solver = importlib.import_module(name[:-len('.py')])
+
+        r, c, grid = verify.read_input(input_file)
+        score, moves = solver.solve(r, c, grid, budget)
+
+        output = io.StringIO()
+        engine.print_solution(moves, score, file=output)
+    except Exception as e:
+        return False, 0, f"Solver error: {str(e)}", None, None
+
+    verification = None
+    if check:
+        is_valid, verified_score, message = verify.verify_moves(
+            r, c, grid, score, [tuple(move) for move in moves], verbose=False)
+        verification = (is_valid, verified_score, None if is_valid else message)
+    return True, score, None, output.getvalue(), verification
+
+def run_and_verify(solver_script, verifier_script, input_file, output_file, timeout):
+    """
+    Subprocess mode for one input: run the solver, then the verifier if there is one.
+    Returns the same tuple as solve_in_process (without the output text).
+    """
+    success, score, error = run_solver_on_file(solver_script, input_file, output_file, timeout)
+    verification = None
+    if success and verifier_script:
+        verification = verify_solution(verifier_script, input_file, output_file)
+    return success, score, error, None, verification
+
+def run_all_tests(input_dir, output_dir, solver_script, verifier_script=None, mode='subprocess', jobs=1,
+                  budget=None, timeout=30.0, timeout_per_kcell=3.0):
     """
     Run solver on all input files in a directory.
     """
@@ -104,14 +164,49 @@ def run_all_tests(input_dir, output_dir, solver_script, verifier_script=None):
     
     results = []
     
-    for input_file in input_files:
+    check = bool(verifier_script and os.path.exists(verifier_script))
+    output_files = [os.path.join(output_dir, os.path.basename(input_file).replace('.txt', '_output.txt'))
+                    for input_file in input_files]
+
+    timeouts = [input_timeout(input_file, timeout, timeout_per_kcell) for input_file in input_files]
+
+    # start every input on the pool, then collect the results in input order so the report doesn't
+    # depend on which job finished first
+    if mode == 'inprocess':
+        def submit(pool, input_file):
+            return pool.apply_async(solve_in_process, (solver_script, input_file, budget, check))
+        pool = multiprocessing.Pool(jobs)
+        futures = [submit(pool, input_file) for input_file in input_files]
+    else:
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        futures = [pool.submit(run_and_verify, solver_script, verifier_script if check else None, input_file,
+                               output_file, seconds)
+                   for input_file, output_file, seconds in zip(input_files, output_files, timeouts)]
+
+    for index, (input_file, output_file) in enumerate(zip(input_files, output_files)):
         base_name = os.path.basename(input_file)
-        output_file = os.path.join(output_dir, base_name.replace('.txt', '_output.txt'))
         
         print(f"\nProcessing: {base_name}")
         
         # Run solver
-        success, score, error = run_solver_on_file(solver_script, input_file, output_file)
+        if mode == 'inprocess':
+            try:
+                success, score, error, output_text, verification = futures[index].get(timeouts[index])
+            except multiprocessing.TimeoutError:
+                success, score, error, output_text, verification = (
+                    False, 0, f"Solver timeout ({timeouts[index]:g}s)", None, None)
+                # a running solve() can only be stopped with its worker, so replace the pool and
+                # restart the inputs that hadn't finished yet
+                pool.terminate()
+                pool = multiprocessing.Pool(jobs)
+                for later in range(index + 1, len(input_files)):
+                    if not futures[later].ready():
+                        futures[later] = submit(pool, input_files[later])
+        else:
+            success, score, error, output_text, verification = futures[index].result()
+        if success and output_text is not None:
+            with open(output_file, 'w') as f:
+                f.write(output_text)
         
         if not success:
             print(f"  ✗ Solver failed: {error}")
@@ -127,10 +222,8 @@ def run_all_tests(input_dir, output_dir, solver_script, verifier_script=None):
         print(f"  Solver score: {score}")
         
         # Verify if verifier script is provided
-        if verifier_script and os.path.exists(verifier_script):
-            is_valid, verified_score, verify_error = verify_solution(
-                verifier_script, input_file, output_file
-            )
+        if check:
+            is_valid, verified_score, verify_error = verification
             
             if is_valid:
                 print(f"  ✓ Verified: {verified_score}")
@@ -163,6 +256,12 @@ def run_all_tests(input_dir, output_dir, solver_script, verifier_script=None):
                 'error': None
             })
     
+    if mode == 'inprocess':
+        pool.close()
+        pool.join()
+    else:
+        pool.shutdown()
+    
     # Print summary
     print("\n" + "=" * 80)
     print("SUMMARY")
@@ -217,6 +316,15 @@ def main():
     parser.add_argument('output_dir', help='Directory to save output files')
     parser.add_argument('--solver', default='solver.py', help='Solver script (default: solver.py)')
     parser.add_argument('--verifier', default=None, help='Verifier script (optional)')
+    parser.add_argument('--mode', choices=['subprocess', 'inprocess'], default='subprocess',
+                        help='Run the solver script per input (default), or call its solve() in worker processes')
+    parser.add_argument('--jobs', type=int, default=1, help='Inputs to run at once (default: 1)')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='Seconds passed to solve() as its budget in --mode inprocess')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Base timeout per input in seconds (default: 30)')
+    parser.add_argument('--timeout-per-kcell', type=float, default=3.0,
+                        help='Extra timeout per 1000 squares of the grid (default: 3)')
     
     args = parser.parse_args()
     
@@ -235,7 +343,8 @@ def main():
         print(f"Error: Input directory '{args.input_dir}' not found")
         sys.exit(1)
     
-    run_all_tests(args.input_dir, args.output_dir, args.solver, args.verifier)
+    run_all_tests(args.input_dir, args.output_dir, args.solver, args.verifier, args.mode, args.jobs, args.budget,
+                  args.timeout, args.timeout_per_kcell)
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,8 @@ Validates solutions for the AlgoBOWL problem.
 """
 
 import sys
-from copy import deepcopy
+
+import engine
 
 
 def read_input(input_file):
@@ -12,16 +13,33 @@ def read_input(input_file):
     with open(input_file, 'r') as f:
         lines = f.readlines()
 
-    # Parse dimensions
-    r, c = map(int, lines[0].split())
+    # Parse dimensions and grid (stored with row 0 at top, matching the solvers)
+    return engine.parse_grid(lines)
 
-    # Parse grid (store with row 0 at top, matching solver.py)
-    grid = []
-    for i in range(r):
-        row = [int(ch) for ch in lines[i + 1].strip()]
-        grid.append(row)
 
-    return r, c, grid
+def parse_output(lines):
+    """
+    Parse the output format (score, number of moves, then one move per line).
+    Raises ValueError if the output is malformed.
+    """
+    if len(lines) < 2:
+        raise ValueError(f"expected a score line and a move count line, found {len(lines)} lines")
+    claimed_score = int(lines[0].strip())
+    num_moves = int(lines[1].strip())
+
+    # each move is: color, count, row (1-indexed from bottom), col (1-indexed from left)
+    body = lines[2:num_moves + 2]
+    if len(body) < num_moves:
+        raise ValueError(f"expected {num_moves} move lines, found {len(body)}")
+    # each line is split on its own, so a short line is still an error and anything after the
+    # fourth number on a line is ignored
+    split = [line.split() for line in body]
+    for line_num, parts in enumerate(split, 3):
+        if len(parts) < 4:
+            raise ValueError(f"line {line_num} has {len(parts)} numbers, expected 4 (color, count, row, col)")
+    moves = [(int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])) for parts in split]
+
+    return claimed_score, moves
 
 
 def read_output(output_file):
@@ -29,84 +47,161 @@ def read_output(output_file):
     with open(output_file, 'r') as f:
         lines = f.readlines()
 
-    claimed_score = int(lines[0].strip())
-    num_moves = int(lines[1].strip())
+    return parse_output(lines)
 
-    moves = []
-    for i in range(num_moves):
-        parts = lines[i + 2].split()
-        color = int(parts[0])
-        count = int(parts[1])
-        row = int(parts[2])  # 1-indexed from bottom
-        col = int(parts[3])  # 1-indexed from left
-        moves.append((color, count, row, col))
-
-    return claimed_score, moves
 
+def to_columns(r, grid):
+    """
+    Turn a grid (row 0 at top) into a list of columns, each listed bottom square first.
+    This matches the output coordinates (row 1 is the bottom) and makes gravity a plain list delete.
 
-def find_connected_component(grid, r, c, start_row, start_col, color):
+    Every column gets an empty square on top and there's an all-empty column at the end, so the
+    neighbors of any square can be looked at without bounds checks (row - 1 == -1 and col - 1 == -1
+    wrap around to that padding).
     """
-    Find all squares connected to the starting position with the same color
-    Using BFS to find the connected component
-    Returns a list of (row, col) tuples
+    columns = [list(column) + [engine.EMPTY] for column in zip(*reversed(grid))]
+    columns.append([engine.EMPTY] * (r + 1))
+    return columns
+
+
+def find_group(columns, r, col, row):
+    """Every square connected to (col, row) with the same color, as col * (r + 1) + row keys."""
+    color = columns[col][row]
+    stride = r + 1
+    start = col * stride + row
+    group = {start}
+    stack = [start]
+    while stack:
+        key = stack.pop()
+        col, row = divmod(key, stride)
+        column = columns[col]
+        # neighbors above, below, right and left
+        if column[row + 1] == color and key + 1 not in group:
+            group.add(key + 1)
+            stack.append(key + 1)
+        if column[row - 1] == color and key - 1 not in group:
+            group.add(key - 1)
+            stack.append(key - 1)
+        if columns[col + 1][row] == color and key + stride not in group:
+            group.add(key + stride)
+            stack.append(key + stride)
+        if columns[col - 1][row] == color and key - stride not in group:
+            group.add(key - stride)
+            stack.append(key - stride)
+    return group
+
+
+def remove_group(columns, r, group):
+    """Remove a group's squares (squares above fall down) and drop columns that became empty."""
+    stride = r + 1
+    empty = engine.EMPTY
+    touched = []
+    # highest key first: right to left, and top to bottom within a column, so deletes don't shift
+    # squares that still have to be deleted
+    for key in sorted(group, reverse=True):
+        col, row = divmod(key, stride)
+        column = columns[col]
+        del column[row]
+        column.append(empty)
+        if not touched or touched[-1] != col:
+            touched.append(col)
+    for col in touched:
+        if columns[col][0] == empty:
+            del columns[col]
+
+
+def play_move(columns, r, c, move_num, move):
+    """Check one (color, count, row, col) move and apply it. Returns an error message, or None if it's legal."""
+    color, count, row_1indexed, col_1indexed = move
+
+    # Output coordinates are 1-indexed from the bottom-left, which is how columns are stored
+    row = row_1indexed - 1
+    col = col_1indexed - 1
+
+    # Validate coordinates
+    if not (0 <= row < r and 0 <= col < c):
+        return f"Move {move_num}: Invalid coordinates ({row_1indexed}, {col_1indexed})"
+
+    # Check if the specified square exists and has the correct color
+    if col >= len(columns) - 1 or columns[col][row] == engine.EMPTY:
+        return f"Move {move_num}: Square at ({row_1indexed}, {col_1indexed}) is empty"
+
+    if columns[col][row] != color:
+        return f"Move {move_num}: Claimed color doesn't match"
+
+    # Find the connected component
+    group = find_group(columns, r, col, row)
+
+    # Verify the count
+    if len(group) != count:
+        return f"Move {move_num}: Claimed {count} squares but found {len(group)} squares"
+
+    # Verify we're removing at least 2 squares
+    if count < 2:
+        return f"Move {move_num}: Cannot remove fewer than 2 squares (tried to remove {count})"
+
+    # Apply the move (remove blocks and apply gravity)
+    remove_group(columns, r, group)
+    return None
+
+
+def verify_many(r, c, initial_grid, outputs):
     """
-    if grid[start_row][start_col] != color or grid[start_row][start_col] == -1:
-        return []
-
-    visited = set()
-    to_check = [(start_row, start_col)]
-    component = []
-
-    while to_check:
-        curr_row, curr_col = to_check.pop(0)
-
-        if (curr_row, curr_col) in visited:
+    Verify several parsed (claimed_score, moves) outputs for the same grid.
+    Outputs that start with the same moves only replay that shared prefix once: they're sorted so
+    shared prefixes sit next to each other, and the board is only copied where two of them branch.
+    Returns (results, moves_played), with one (is_valid, actual_score, error_message) per output.
+    """
+    results = [None] * len(outputs)
+    order = sorted(range(len(outputs)), key=lambda i: outputs[i][1])
+    played = 0
+
+    # each entry: (output indices sharing the first depth moves, depth, board after them, score so far)
+    pending = [(order, 0, to_columns(r, initial_grid), 0)]
+    while pending:
+        group, depth, columns, score = pending.pop()
+        first = outputs[group[0]][1]
+        last = outputs[group[-1]][1]
+
+        # play the moves every output in the group has in common (the first and last differ soonest)
+        error = None
+        while depth < min(len(first), len(last)) and first[depth] == last[depth]:
+            move = first[depth]
+            try:
+                error = play_move(columns, r, c, depth + 1, move)
+            except Exception as e:
+                error = f"Error during verification: {str(e)}"
+            if error:
+                break
+            played += 1
+            score += (move[1] - 1) ** 2
+            depth += 1
+
+        if error:
+            for i in group:
+                results[i] = (False, 0, error)
             continue
 
-        visited.add((curr_row, curr_col))
-        component.append((curr_row, curr_col))
-
-        # Check all 4 adjacent cells
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dr, dc in directions:
-            new_row, new_col = curr_row + dr, curr_col + dc
-            if (0 <= new_row < r and 0 <= new_col < c and (new_row, new_col) not in visited
-                    and grid[new_row][new_col] == color):
-                to_check.append((new_row, new_col))
-
-    return component
+        # outputs that end here are done; the rest split up by their next move
+        branches = []
+        for i in group:
+            claimed_score, moves = outputs[i]
+            if len(moves) == depth:
+                if score != claimed_score:
+                    results[i] = (False, score, f"Score mismatch: claimed {claimed_score} but actual is {score}")
+                else:
+                    results[i] = (True, score, "Valid solution")
+            elif branches and outputs[branches[-1][-1]][1][depth] == moves[depth]:
+                branches[-1].append(i)
+            else:
+                branches.append([i])
 
+        for n, branch in enumerate(branches):
+            # the last branch can keep using this board, the others get their own copy
+            board = columns if n == len(branches) - 1 else [column[:] for column in columns]
+            pending.append((branch, depth, board, score))
 
-def apply_gravity(grid, r, c, removed_blocks):
-    """
-    Apply gravity after removing blocks
-    1. Drop blocks down within each column
-    2. Shift columns left if any become empty
-    """
-    # Drop blocks down
-    for i in range(r):
-        for j in range(c):
-            if (i, j) in removed_blocks:
-                # Move everything above down
-                for k in range(i):
-                    grid[i - k][j] = grid[i - k - 1][j]
-                grid[0][j] = -1
-
-    # Shift columns left if empty
-    k = 0
-    loop_iters = 0
-    while k < c and loop_iters < c:
-        if grid[r - 1][k] == -1:
-            # Column k is empty, shift everything left
-            for j in range(k, c - 1):
-                for i in range(r):
-                    grid[i][j] = grid[i][j + 1]
-            # Clear the rightmost column
-            for i in range(r):
-                grid[i][c - 1] = -1
-            loop_iters += 1
-        else:
-            k += 1
+    return results, played
 
 
 def verify_solution(input_file, output_file, verbose=True):
@@ -115,12 +210,29 @@ def verify_solution(input_file, output_file, verbose=True):
     Returns (is_valid, actual_score, error_message)
     """
     try:
-        # Read input and output
         r, c, initial_grid = read_input(input_file)
+    except Exception as e:
+        return False, 0, f"Error during verification: {str(e)}"
+    try:
         claimed_score, moves = read_output(output_file)
+    except ValueError as e:
+        # parse_output's errors say what's wrong with the output (a bad number, missing move lines)
+        return False, 0, f"Malformed output: {str(e)}"
+    except Exception as e:
+        return False, 0, f"Error during verification: {str(e)}"
 
-        # Make a working copy of the grid
-        grid = deepcopy(initial_grid)
+    return verify_moves(r, c, initial_grid, claimed_score, moves, verbose)
+
+
+def verify_moves(r, c, initial_grid, claimed_score, moves, verbose=True):
+    """
+    Verify already parsed moves against an already parsed grid (so a grid can be checked against many
+    outputs without reading it again).
+    Returns (is_valid, actual_score, error_message)
+    """
+    try:
+        # Make a working board: columns listed bottom square first, so gravity is just deleting
+        columns = to_columns(r, initial_grid)
 
         actual_score = 0
 
@@ -131,50 +243,23 @@ def verify_solution(input_file, output_file, verbose=True):
             print()
 
         # Simulate each move
-        for move_num, (color, count, row_1indexed, col_1indexed) in enumerate(moves, 1):
+        for move_num, move in enumerate(moves, 1):
+            color, count, row_1indexed, col_1indexed = move
             if verbose:
                 print(f"Move {move_num}: Remove {count} squares of color {color} at ({row_1indexed}, {col_1indexed})")
 
-            # Convert 1-indexed coordinates (from bottom-left) to 0-indexed (from top-left)
-            # Bottom row is 1, top row is r
-            # So row_1indexed=1 corresponds to grid[r-1], row_1indexed=r corresponds to grid[0]
-            row_0indexed = r - row_1indexed
-            col_0indexed = col_1indexed - 1
-
-            # Validate coordinates
-            if not (0 <= row_0indexed < r and 0 <= col_0indexed < c):
-                return False, 0, f"Move {move_num}: Invalid coordinates ({row_1indexed}, {col_1indexed})"
-
-            # Check if the specified square exists and has the correct color
-            if grid[row_0indexed][col_0indexed] == -1:
-                return False, 0, f"Move {move_num}: Square at ({row_1indexed}, {col_1indexed}) is empty"
-
-            if grid[row_0indexed][col_0indexed] != color:
-                return False, 0, f"Move {move_num}: Claimed color doesn't match"
-
-            # Find the connected component
-            component = find_connected_component(grid, r, c, row_0indexed, col_0indexed, color)
-
-            # Verify the count
-            if len(component) != count:
-                return False, 0, f"Move {move_num}: Claimed {count} squares but found {len(component)} squares"
-
-            # Verify we're removing at least 2 squares
-            if count < 2:
-                return False, 0, f"Move {move_num}: Cannot remove fewer than 2 squares (tried to remove {count})"
+            # Check the move, then remove blocks and apply gravity
+            error = play_move(columns, r, c, move_num, move)
+            if error:
+                return False, 0, error
 
             # Calculate score for this move
             move_score = (count - 1) ** 2
             actual_score += move_score
 
             if verbose:
-                print(f"  Found {len(component)} connected squares")
+                print(f"  Found {count} connected squares")
                 print(f"  Score for this move: ({count} - 1)^2 = {move_score}")
-
-            # Apply the move (remove blocks and apply gravity)
-            apply_gravity(grid, r, c, component)
-
-            if verbose:
                 print()
 
         # Check if the total score matches
@@ -0,0 +1,80 @@
+"""
+Same Game Zobrist Hashing
+Different click orders often lead to the same board. A Zobrist hash gives each (square, color) pair
+a random 64-bit key and hashes a board as the XOR of the keys of its non-empty squares, so the hash
+can be updated for just the squares a move changes (engine.Board.remove does this once keys are set)
+and equal boards always get equal hashes.
+
+TranspositionTable is a bounded map from those hashes to whatever a search wants to remember about
+a board (eg. the best score found from there), with counters for tuning its size.
+"""
+
+import random
+from collections import OrderedDict
+
+from engine import EMPTY
+
+
+def make_keys(board, seed=0):
+    """Random keys for every color on the board: {color: [key for each square]}."""
+    rng = random.Random(seed)
+    colors = sorted(set(board.cells) - {EMPTY})
+    return {color: [rng.getrandbits(64) for _ in range(len(board.cells))] for color in colors}
+
+
+def attach(board, seed=0):
+    """Give board fresh keys and start tracking its hash. Returns the board."""
+    board.set_keys(make_keys(board, seed))
+    return board
+
+
+class TranspositionTable:
+    """
+    Bounded hash -> (value, depth) table.
+    When full, the least recently used entry is evicted. An entry is only overwritten by a store with
+    at least the same depth (how much search went into the value), so deeper results are kept.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        """The (value, depth) stored for key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key, value, depth=0):
+        """Remember value for key, unless a deeper search already stored one."""
+        entries = self.entries
+        entry = entries.get(key)
+        if entry is not None:
+            if entry[1] > depth:
+                return
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = (value, depth)
+        self.stores += 1
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self):
+        return (f"transposition table: {len(self.entries)}/{self.capacity} entries, "
+                f"{self.hits} hits / {self.hits + self.misses} probes ({self.hit_rate():.1%}), "
+                f"{self.evictions} evictions")